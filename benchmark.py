@@ -0,0 +1,171 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import hanoi as ht
+
+
+def _generation(n):
+    """Énumération des mouvements, sans modifier les tours."""
+    count = 0
+    for _ in ht.HanoiTowers.moves(n, 0, 1):
+        count += 1
+    return count
+
+
+def _solve(n):
+    """Résolution complète avec mise à jour des tours, par l'intermédiaire d'un callback."""
+    count = [0]
+
+    def compter(start, finish):
+        count[0] += 1
+    ht.HanoiTowers(n).hanoiTransfer(n, 0, 1, compter)
+    return count[0]
+
+
+def _batch(n):
+    """Résolution complète avec livraison des mouvements par lots."""
+    count = [0]
+
+    def compter(lot):
+        count[0] += len(lot)
+    ht.HanoiTowers(n).hanoiTransferBatch(n, 0, 1, compter, format='array')
+    return count[0]
+
+
+def _validation(n):
+    """Résolution avec contrôle de chaque mouvement (mode check), suivie d'une validation complète."""
+    puzzle = ht.HanoiTowers(n, check='raise')
+    count = sum(1 for _ in puzzle.hanoiTransfer(n, 0, 1))
+    puzzle.valid()
+    return count
+
+
+def _rendering(n):
+    """Représentation textuelle du puzzle, à chaque étape d'une résolution de min(n, 10) disques."""
+    m = min(n, 10)
+    puzzle = ht.HanoiTowers(n)
+    count = 0
+    for _ in puzzle.hanoiTransfer(m, 0, 1):
+        str(puzzle)
+        count += 1
+    return count
+
+
+# Les mesures trop courtes sont dominées par le bruit de la machine:  compare ne signale pas de régression pour moins
+# de GATED_DISKS disques, ni pour une mesure de moins de GATED_SECONDS secondes.
+GATED_DISKS = 13
+GATED_SECONDS = 1e-3
+# Nombre minimal d'essais par mesure pour comparer à une référence:  le meilleur temps d'un seul essai varie trop.
+GATED_REPEAT = 3
+
+# Chaque cas reçoit le nombre de disques et retourne le nombre d'opérations effectuées.
+CASES = {
+    'generation': _generation,
+    'solve': _solve,
+    'batch': _batch,
+    'validation': _validation,
+    'rendering': _rendering,
+}
+
+
+def measure(case, n, repeat):
+    """Mesure un cas:  meilleur temps sur repeat essais, débit et pic de mémoire (tracemalloc, sur un essai séparé pour
+    ne pas fausser le temps).
+
+    Returns:
+        (dict):  Résultat de la mesure."""
+
+    fonction = CASES[case]
+    meilleur = None
+    for _ in range(repeat):
+        debut = time.perf_counter()
+        operations = fonction(n)
+        duree = time.perf_counter() - debut
+        if meilleur is None or duree < meilleur:
+            meilleur = duree
+
+    tracemalloc.start()
+    fonction(n)
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'case': case,
+        'n': n,
+        'operations': operations,
+        'seconds': meilleur,
+        'opsPerSecond': operations / meilleur if meilleur else float('inf'),
+        'peakBytes': pic,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Compare les résultats à une référence.  Un cas est une régression si son débit est plus petit que celui de la
+    référence d'une fraction plus grande que tolerance.  Les mesures trop courtes sont ignorées (voir GATED_DISKS).
+
+    Returns:
+        (liste de str):  Description des régressions trouvées."""
+
+    reference = {(r['case'], r['n']): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        ref = reference.get((r['case'], r['n']))
+        if ref is None or r['n'] < GATED_DISKS or min(r['seconds'], ref['seconds']) < GATED_SECONDS:
+            continue
+        if r['opsPerSecond'] < ref['opsPerSecond'] * (1 - tolerance):
+            regressions.append(f"{r['case']} n={r['n']}:  {r['opsPerSecond']:.0f} op/s, "
+                               f"référence {ref['opsPerSecond']:.0f} op/s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesures de performance du solveur des tours de Hanoi.")
+    parser.add_argument('--min', type=int, default=10, help="Plus petit nombre de disques.")
+    parser.add_argument('--max', type=int, default=26, help="Plus grand nombre de disques.")
+    parser.add_argument('--step', type=int, default=2, help="Écart entre deux nombres de disques.")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre d'essais par mesure.")
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES), help="Cas à mesurer.")
+    parser.add_argument('--output', help="Fichier JSON où écrire les résultats.")
+    parser.add_argument('--baseline', help="Fichier JSON de référence, écrit avec --output sur la même machine, "
+                                           "auquel comparer les résultats.")
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="Baisse de débit tolérée par rapport à la référence (0.5 = 50%%).")
+    args = parser.parse_args(argv)
+    if args.baseline and args.repeat < GATED_REPEAT:
+        parser.error(f"--baseline demande au moins --repeat {GATED_REPEAT}.")
+
+    results = []
+    for n in range(args.min, args.max + 1, args.step):
+        for case in args.cases:
+            r = measure(case, n, args.repeat)
+            results.append(r)
+            print(f"{case:<12} n={n:<3} {r['seconds']:10.4f} s {r['opsPerSecond']:14.0f} op/s "
+                  f"{r['peakBytes'] / 1024:10.1f} Kio")
+
+    rapport = {
+        'python': sys.version,
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rapport, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("RÉGRESSIONS:")
+            for r in regressions:
+                print("  " + r)
+            return 1
+        print("Aucune régression.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
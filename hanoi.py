@@ -1,11 +1,40 @@
+import logging
+import time
+from array import array
+from functools import lru_cache
+from itertools import islice
+
+from hanoistats import HanoiStats
+from hanoitext import renderTowers
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel:  seules moveRange et iterMoveRange en ont besoin.
+    np = None
+
 NTOWER = 3
 
+logger = logging.getLogger(__name__)
+
+# Les six mouvements possibles entre trois tours.  L'indice d'un couple (départ, arrivée) dans ce tuple est son code,
+# utilisé pour conserver un mouvement dans un seul octet (voir HanoiTowers.moveCode).
+PEGPAIRS = ((0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1))
+
+# moveRange calcule sur des numéros de mouvement de 64 bits:  b + 1 doit tenir dans un int64.
+MAX_RANGE_INDEX = (1 << 63) - 1
+
 class Tower:
     """
-    Classe représentant une tour:  essentiellement une liste de nombres, où chaque nombre représente un disque.
+    Classe représentant une tour:  essentiellement une pile de nombres, où chaque nombre représente un disque.
+
+    Les disques sont conservés dans un tableau compact (array) du bas vers le haut:  le disque du dessus est donc le
+    dernier élément, ce qui permet de l'enlever, de l'ajouter ou de le consulter en temps constant.
     """
+
+    __slots__ = ('disk',)
+
     def __init__(self, number):
-        self.disk = [i for i in range(number)]
+        self.disk = array('I', range(number - 1, -1, -1))
 
     def remove(self):
         """
@@ -16,9 +45,7 @@ class Tower:
         """
         if self.count() == 0:
             return
-        first = self.disk[0]
-        self.disk = self.disk[1:]
-        return first
+        return self.disk.pop()
         
     def count(self):
         """
@@ -32,14 +59,48 @@ class Tower:
         Args:
             d (int):  Numéro du disque à ajouter.
         """
-        self.disk[0:0]=[d]
+        self.disk.append(d)
+
+    def top(self):
+        """
+        Retourne le numéro du disque du dessus, sans l'enlever, ou None si la tour est vide.
+        """
+        if self.disk:
+            return self.disk[-1]
+        return None
 
     def getDisk(self):
         """
-        Retourne la liste des disques.
+        Retourne la liste des disques, en commençant par le disque du dessus.
+        """
+        return self.disk[::-1].tolist()
+
+    def diskAt(self, index):
+        """
+        Retourne le disque à la position index, en partant du bas de la tour.
+        """
+        return self.disk[index]
+
+    def setDisks(self, disks):
+        """
+        Remplace les disques de la tour.
+        Args:
+            disks (liste de int):  Numéros des disques, en commençant par le disque du dessus (comme getDisk).
         """
-        return self.disk
+        self.disk = array('I', reversed(disks))
         
+    def bits(self):
+        """
+        Retourne les disques de la tour sous forme de masque:  le bit d est à 1 si le disque d est sur la tour.
+        """
+        return sum(1 << d for d in self.disk)
+
+    def setBits(self, mask):
+        """
+        Remplace les disques de la tour par ceux d'un masque (voir bits), empilés dans l'ordre.
+        """
+        self.disk = array('I', (d for d in range(mask.bit_length() - 1, -1, -1) if mask >> d & 1))
+
     def valid(self):
         """
         Vérifie si la tour est valide:  c'est à dire que les disque sont en ordre de numéro.
@@ -52,21 +113,159 @@ class Tower:
             return True
 
         # La tour n'est pas valide si elle contient des disques dans le mauvais ordre.
-        prec = self.disk[0]
-        for suiv in self.disk[1:]:
+        prec = self.disk[-1]
+        for suiv in self.disk[-2::-1]:
             if prec >= suiv:
                 return False
+            prec = suiv
         return True
 
     def __str__(self):
         """
         Représentation textuelle de la tour.
         """
-        t = ""
-        for d in self.disk:
-            t += str(d) + '\n'
-        t += str(tour.valid())
-        return t
+        return "".join(str(d) + '\n' for d in self.getDisk()) + str(self.valid())
+
+class BitTower:
+    """
+    Tour représentée par un masque de bits:  le bit d est à 1 si le disque d est sur la tour.  Puisque le disque 0 est
+    le plus petit, le disque du dessus est le bit à 1 le plus faible, obtenu en temps constant avec mask & -mask.  Le
+    masque est un simple entier:  l'état des tours se copie, se compare et se hache sans allocation de liste (voir
+    HanoiTowers.snapshot).
+
+    Un masque ne peut représenter qu'une tour valide:  un disque ajouté sur un disque plus petit prendrait sa place dans
+    la pile, sans que valid() puisse le détecter.  HanoiTowers contrôle donc toujours les mouvements avec cette
+    représentation (mode check 'count' par défaut), et les mouvements illégaux sont refusés plutôt qu'effectués.
+    """
+
+    __slots__ = ('mask',)
+
+    def __init__(self, number):
+        self.mask = (1 << number) - 1
+
+    def remove(self):
+        """
+        Enlève le premier disque de la tour.
+
+        Returns:
+            (int):  Le numéro du disque enlevé.
+        """
+        bit = self.mask & -self.mask
+        if bit == 0:
+            return
+        self.mask ^= bit
+        return bit.bit_length() - 1
+
+    def count(self):
+        """
+        Retourne le nombre de disque sur la tour.
+        """
+        return self.mask.bit_count()
+
+    def add(self, d):
+        """
+        Ajoute un disque au début de la tour.
+        Args:
+            d (int):  Numéro du disque à ajouter.
+        """
+        self.mask |= 1 << d
+
+    def top(self):
+        """
+        Retourne le numéro du disque du dessus, sans l'enlever, ou None si la tour est vide.
+        """
+        if self.mask:
+            return (self.mask & -self.mask).bit_length() - 1
+        return None
+
+    def getDisk(self):
+        """
+        Retourne la liste des disques, en commençant par le disque du dessus.
+        """
+        return [d for d in range(self.mask.bit_length()) if self.mask >> d & 1]
+
+    def diskAt(self, index):
+        """
+        Retourne le disque à la position index, en partant du bas de la tour.  Le temps est proportionnel à index:  pour
+        parcourir toute la tour, getDisk est préférable.
+        """
+        mask = self.mask
+        for _ in range(index):
+            mask ^= 1 << (mask.bit_length() - 1)
+        if mask == 0:
+            raise IndexError("Position hors de la tour.")
+        return mask.bit_length() - 1
+
+    def setDisks(self, disks):
+        """
+        Remplace les disques de la tour.
+        Args:
+            disks (liste de int):  Numéros des disques, en commençant par le disque du dessus (comme getDisk).
+        """
+        self.mask = sum(1 << d for d in disks)
+
+    def bits(self):
+        """
+        Retourne le masque des disques de la tour.
+        """
+        return self.mask
+
+    def setBits(self, mask):
+        """
+        Remplace les disques de la tour par ceux d'un masque.
+        """
+        self.mask = mask
+
+    def valid(self):
+        """
+        Une tour représentée par un masque est toujours valide (voir la description de la classe).
+        """
+        return True
+
+    def __str__(self):
+        """
+        Représentation textuelle de la tour.
+        """
+        return "".join(str(d) + '\n' for d in self.getDisk()) + str(self.valid())
+
+# Représentations possibles des tours, choisies avec le paramètre backend de HanoiTowers.
+BACKENDS = {'array': Tower, 'bits': BitTower}
+
+class IllegalMoveError(ValueError):
+    """
+    Mouvement illégal:  tour de départ vide, ou disque déposé sur un disque plus petit.
+    """
+
+@lru_cache(maxsize=32)
+def frameStewartTable(number, towers):
+    """
+    Table des meilleurs découpages de l'algorithme de Frame-Stewart, calculée une seule fois par couple (number, towers)
+    et partagée entre tous les appels.
+
+    Pour transférer i disques avec k tours, on transfère les t disques du dessus vers une tour intermédiaire (avec les k
+    tours), les i-t autres vers la destination (avec les k-1 tours restantes), puis les t disques sur la destination.
+    Le meilleur t minimise 2 * coups[k][t] + coups[k-1][i-t].
+
+    Args:
+        number (int):  Nombre maximal de disques.
+        towers (int):  Nombre maximal de tours, au moins 3.
+    Returns:
+        (tuple, tuple):  coups[k][i] est le nombre minimal de mouvements et split[k][i] le meilleur t, pour i disques
+        et k tours (les lignes k < 3 sont vides).
+    """
+    if towers < 3:
+        raise ValueError("Il faut au moins 3 tours.")
+    coups = [()] * 3 + [tuple((1 << i) - 1 for i in range(number + 1))]
+    split = [()] * 3 + [tuple(max(i - 1, 0) for i in range(number + 1))]
+    for k in range(4, towers + 1):
+        coupsK, splitK = [0, 1], [0, 0]
+        for i in range(2, number + 1):
+            t = min(range(1, i), key=lambda t: 2 * coupsK[t] + coups[k - 1][i - t])
+            coupsK.append(2 * coupsK[t] + coups[k - 1][i - t])
+            splitK.append(t)
+        coups.append(tuple(coupsK[:number + 1]))
+        split.append(tuple(splitK[:number + 1]))
+    return tuple(coups), tuple(split)
 
 class HanoiTowers():
     """
@@ -78,13 +277,33 @@ class HanoiTowers():
 
     numberOfTowers = 3
 
-    def __init__(self, nombre):
+    def __init__(self, nombre, towers=NTOWER, check=None, backend='array'):
         """Constructeur
         Args:
-            nombre (int):  Nombre de disques initial sur la première tour."""
+            nombre (int):  Nombre de disques initial sur la première tour.
+            towers (int):  Nombre de tours, au moins 3.
+            check (str):  Contrôle des mouvements dans transfer.  None:  aucun contrôle, un mouvement à partir d'une tour
+            vide est ignoré.  'count':  les mouvements illégaux sont refusés et comptés dans l'attribut violations.
+            'log':  comme 'count', et un avertissement est journalisé.  'raise':  lève IllegalMoveError.
+            backend (str):  Représentation des tours.  'array':  objets Tower, une pile de numéros par tour.  'bits':
+            objets BitTower, un masque de bits par tour, ce qui rend snapshot et restore très peu coûteux.  Un masque ne
+            peut pas représenter une tour désordonnée:  avec 'bits', le mode check None devient 'count'."""
 
-        self.tour = [Tower(nombre)]
-        self.tour[1:] = [Tower(0) for _ in range(1, HanoiTowers.numberOfTowers)]
+        if towers < 3:
+            raise ValueError("Il faut au moins 3 tours.")
+        if check not in (None, 'count', 'log', 'raise'):
+            raise ValueError(f"Mode de contrôle inconnu:  {check}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Représentation inconnue:  {backend}")
+        self.check = 'count' if check is None and backend == 'bits' else check
+        self.backend = backend
+        self.violations = 0
+        self.stats = None
+        self.number = nombre
+        self.numberOfTowers = towers
+        towerClass = BACKENDS[backend]
+        self.tour = [towerClass(nombre)]
+        self.tour[1:] = [towerClass(0) for _ in range(1, self.numberOfTowers)]
 
     def count(self):
         """
@@ -94,71 +313,693 @@ class HanoiTowers():
 
     def valid(self):
         """
-        Retourne True si les trois tours sont valides:  Si les disques sont ordonnées sur chaque tour.
+        Retourne True si toutes les tours sont valides:  Si les disques sont ordonnées sur chaque tour.
         """
-        return all([self.tour[i].valid() for i in range(HanoiTowers.numberOfTowers)])
+        return all(self.tour[i].valid() for i in range(self.numberOfTowers))
 
     def transfer(self, start, finish):
         """
-        Prend le disque du dessus sur la tour start et le dépose sur le dessus de la tour finish.
+        Prend le disque du dessus sur la tour start et le dépose sur le dessus de la tour finish.  Si le mode check est
+        actif, le mouvement est contrôlé en temps constant en comparant les disques du dessus des deux tours:  valid()
+        n'est alors utile que pour un état chargé de l'extérieur.
         """
-        if self.tour[start].count() == 0:
+        if self.check is not None:
+            disque = self.tour[start].top()
+            dessus = self.tour[finish].top()
+            if disque is None or (dessus is not None and dessus < disque):
+                self._violation(start, finish, disque, dessus)
+                return
+        elif self.tour[start].count() == 0:
             return
         self.tour[finish].add(self.tour[start].remove())
 
+    def _violation(self, start, finish, disque, dessus):
+        """
+        Traite un mouvement illégal refusé par transfer, selon le mode check.
+        """
+        self.violations += 1
+        if disque is None:
+            message = f"Mouvement illégal {start} -> {finish}:  la tour {start} est vide."
+        else:
+            message = f"Mouvement illégal {start} -> {finish}:  le disque {disque} irait sur le disque {dessus}."
+        if self.check == 'raise':
+            raise IllegalMoveError(message)
+        if self.check == 'log':
+            logger.warning(message)
+
+    def configuration(self):
+        """
+        Retourne la position de chaque disque.
+
+        Returns:
+            (liste de int):  L'élément d est le numéro de la tour sur laquelle se trouve le disque d.
+        """
+        pegs = [0] * sum(t.count() for t in self.tour)
+        for (i, t) in enumerate(self.tour):
+            for d in t.getDisk():
+                pegs[d] = i
+        return pegs
+
+    def setConfiguration(self, pegs):
+        """
+        Place les disques sur les tours selon une configuration donnée.  Sur chaque tour, les disques sont empilés
+        dans l'ordre, le disque 0 (le plus petit) sur le dessus.
+
+        Args:
+            pegs (liste de int):  L'élément d est le numéro de la tour sur laquelle placer le disque d.
+        """
+        disques = [[] for _ in self.tour]
+        for (d, p) in enumerate(pegs):
+            disques[p].append(d)
+        for (t, disks) in zip(self.tour, disques):
+            t.setDisks(disks)
+
+    def snapshot(self):
+        """
+        Retourne une copie immuable de l'état des tours, qui peut servir de clé de dictionnaire ou être comparée à une
+        autre.  Avec backend='bits', elle ne coûte qu'un tuple d'entiers déjà calculés.
+
+        Returns:
+            (tuple de int):  Le masque des disques de chaque tour (voir Tower.bits).
+        """
+        return tuple(t.bits() for t in self.tour)
+
+    def restore(self, snapshot):
+        """
+        Remet les tours dans l'état d'une copie faite avec snapshot.
+        """
+        if len(snapshot) != len(self.tour):
+            raise ValueError("La copie n'a pas le même nombre de tours.")
+        for (t, mask) in zip(self.tour, snapshot):
+            t.setBits(mask)
+
 ########################################################################################################################
 #
 #               Algorithme principal
 #
 ########################################################################################################################
 
-    def hanoiTransfer(self, number, start, finish, callback):
+    @staticmethod
+    def moves(number, start, finish):
+        """
+        Générateur des mouvements qui transfèrent number disques de la tour start à la tour finish.  Ne modifie aucune
+        tour:  les mouvements sont seulement énumérés, un à la fois, au fur et à mesure qu'on les demande.
+
+        C'est la même récurrence que celle décrite dans hanoiTransfer, mais les appels récursifs sont remplacés par une
+        pile explicite de sous-problèmes (au plus 2*number éléments).  On peut donc suspendre l'énumération entre deux
+        mouvements, ou la reprendre plus tard, sans pile d'appels Python ni limite de récursion.
+
+        Args:
+            number (int):  Nombre de disques à transférer.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+        Yields:
+            (int, int):  Le couple (tour de départ, tour d'arrivée) de chaque mouvement.
+        """
+        if number <= 0:
+            return
+
+        # Chaque élément de la pile est un sous-problème (nombre de disques, départ, arrivée) qui reste à résoudre.
+        pile = [(number, start, finish)]
+        while pile:
+            number, start, finish = pile.pop()
+
+            # Transférer un seul disque:  on n'a qu'à le transférer.
+            if number == 1:
+                yield start, finish
+
+            # Récurrence:  on empile les trois sous-problèmes dans l'ordre inverse de leur exécution.
+            else:
+                other = 3 - (finish + start)
+                pile.append((number - 1, other, finish))
+                pile.append((1, start, finish))
+                pile.append((number - 1, start, other))
+
+    @staticmethod
+    def frameStewartMoves(number, start, finish, towers):
+        """
+        Générateur des mouvements qui transfèrent number disques de la tour start à la tour finish en utilisant towers
+        tours (algorithme de Frame-Stewart).  Les découpages viennent de frameStewartTable.  Comme pour moves, la
+        récurrence est remplacée par une pile explicite de sous-problèmes et aucune tour n'est modifiée.
+
+        Args:
+            number (int):  Nombre de disques à transférer.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+            towers (int):  Nombre de tours, numérotées de 0 à towers-1.
+        Yields:
+            (int, int):  Le couple (tour de départ, tour d'arrivée) de chaque mouvement.
+        """
+        if number <= 0:
+            return
+        split = frameStewartTable(number, towers)[1]
+
+        # Chaque sous-problème connaît aussi les tours qu'il a le droit d'utiliser.
+        pile = [(number, start, finish, tuple(range(towers)))]
+        while pile:
+            number, start, finish, pegs = pile.pop()
+            if number == 1:
+                yield start, finish
+            else:
+                t = split[len(pegs)][number]
+                other = next(p for p in pegs if p != start and p != finish)
+                pile.append((t, other, finish, pegs))
+                pile.append((number - t, start, finish, tuple(p for p in pegs if p != other)))
+                pile.append((t, start, other, pegs))
+
+    def _checkIndex(self, k, number, last):
+        """
+        Valide un numéro de mouvement pour moveAt et stateAt, et retourne le nombre de disques à utiliser.
+        """
+        if self.numberOfTowers != 3:
+            raise ValueError("Le calcul direct des mouvements n'est possible qu'avec 3 tours.")
+        if number is None:
+            number = self.number
+        if not 0 <= k <= last(number):
+            raise ValueError(f"Numéro de mouvement {k} hors limites pour {number} disques.")
+        return number
+
+    def _checkDisks(self, number):
+        """
+        Vérifie que le puzzle a au moins number disques, avant de placer les tours dans un état calculé.
+        """
+        disques = sum(t.count() for t in self.tour)
+        if number is not None and number > disques:
+            raise ValueError(f"{number} disques demandés, mais le puzzle n'en a que {disques}.")
+
+    @staticmethod
+    def _cycle(number, disk, start, finish):
+        """
+        Retourne les trois tours visitées, dans l'ordre, par un disque dans la solution optimale.  Chaque disque tourne
+        toujours dans le même sens:  start, finish, other si number - disk est impair, sinon start, other, finish.
+        """
+        other = 3 - (finish + start)
+        if (number - disk) & 1:
+            return start, finish, other
+        return start, other, finish
+
+    def moveAt(self, k, number=None, start=0, finish=1):
+        """
+        Calcule directement le mouvement numéro k de la solution, sans passer par les mouvements précédents.
+
+        Le disque déplacé au mouvement k (en comptant à partir de 0) est donné par le nombre de zéros à la fin de
+        l'écriture binaire de k+1, et ce disque s'est déjà déplacé (k+1) >> (disque+1) fois:  sa position découle de
+        son sens de rotation (voir _cycle).
+
+        Args:
+            k (int):  Numéro du mouvement, entre 0 et 2**number - 2.
+            number (int):  Nombre de disques à transférer.  Par défaut, le nombre de disques du puzzle.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+        Returns:
+            (int, int):  Le couple (tour de départ, tour d'arrivée) du mouvement.
+        """
+        number = self._checkIndex(k, number, lambda n: (1 << n) - 2)
+        m = k + 1
+        disk = (m & -m).bit_length() - 1
+        cycle = HanoiTowers._cycle(number, disk, start, finish)
+        j = m >> (disk + 1)
+        return cycle[j % 3], cycle[(j + 1) % 3]
+
+    def stateAt(self, k, number=None, start=0, finish=1):
+        """
+        Calcule directement la position des disques après les k premiers mouvements de la solution, en O(number).
+
+        Args:
+            k (int):  Nombre de mouvements effectués, entre 0 et 2**number - 1.
+            number (int):  Nombre de disques à transférer.  Par défaut, le nombre de disques du puzzle.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+        Returns:
+            (liste de int):  L'élément d est le numéro de la tour sur laquelle se trouve le disque d.
+        """
+        number = self._checkIndex(k, number, lambda n: (1 << n) - 1)
+        pegs = []
+        for disk in range(number):
+            # Nombre de fois que le disque a été déplacé:  il bouge aux mouvements 2**disk, 3 * 2**disk, ...
+            j = (k + (1 << disk)) >> (disk + 1)
+            pegs.append(HanoiTowers._cycle(number, disk, start, finish)[j % 3])
+        return pegs
+
+    def seek(self, k, number=None, start=0, finish=1):
+        """
+        Place les tours dans l'état où elles seraient après les k premiers mouvements de la solution.  Les disques plus
+        gros que number ne sont pas déplacés.  Lève ValueError si le puzzle a moins de number disques.
+
+        Args:
+            k (int):  Nombre de mouvements effectués, entre 0 et 2**number - 1.
+            number (int):  Nombre de disques à transférer.  Par défaut, le nombre de disques du puzzle.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+        """
+        self._checkDisks(number)
+        pegs = self.stateAt(k, number, start, finish)
+        config = self.configuration()
+        config[:len(pegs)] = pegs
+        self.setConfiguration(config)
+
+    def movesFrom(self, k, number=None, start=0, finish=1):
+        """
+        Générateur des mouvements de la solution à partir du mouvement numéro k, calculés directement comme dans
+        moveAt, en temps constant par mouvement.  Ne modifie aucune tour.
+
+        Args:
+            k (int):  Numéro du premier mouvement, entre 0 et 2**number - 1.
+            number (int):  Nombre de disques à transférer.  Par défaut, le nombre de disques du puzzle.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+        Yields:
+            (int, int):  Le couple (tour de départ, tour d'arrivée) de chaque mouvement.
+        """
+        number = self._checkIndex(k, number, lambda n: (1 << n) - 1)
+        cycles = (HanoiTowers._cycle(2, 0, start, finish), HanoiTowers._cycle(1, 0, start, finish))
+        for m in range(k + 1, 1 << number):
+            disk = (m & -m).bit_length() - 1
+            cycle = cycles[(number - disk) & 1]
+            j = m >> (disk + 1)
+            yield cycle[j % 3], cycle[(j + 1) % 3]
+
+    def resumeTransfer(self, k, number=None, start=0, finish=1):
+        """
+        Place les tours dans l'état qui suit les k premiers mouvements (voir seek) et retourne un générateur qui
+        effectue les mouvements restants, comme iterTransfer.
+
+        Args:
+            k (int):  Nombre de mouvements déjà effectués, entre 0 et 2**number - 1.
+            number (int):  Nombre de disques à transférer.  Par défaut, le nombre de disques du puzzle.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+        """
+        self.seek(k, number, start, finish)
+        mouvements = self.movesFrom(k, number, start, finish)
+        if self.stats is not None:
+            number = self.number if number is None else number
+            return self.stats.track(self, mouvements, number, (1 << number) - 1 - k)
+        return self._applyMoves(mouvements)
+
+    def moveRange(self, a, b, number=None, start=0, finish=1):
+        """
+        Calcule en bloc les mouvements numéro a (inclus) à b (exclu) de la solution, avec des opérations NumPy sur les
+        numéros de mouvement plutôt qu'un appel de fonction par mouvement.  Même formule que moveAt.
+
+        Args:
+            a (int):  Numéro du premier mouvement.
+            b (int):  Numéro qui suit le dernier mouvement, au plus 2**number - 1 et moins de MAX_RANGE_INDEX.
+            number (int):  Nombre de disques à transférer.  Par défaut, le nombre de disques du puzzle.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+        Returns:
+            (ndarray, ndarray, ndarray):  Tours de départ, tours d'arrivée et numéros des disques déplacés (uint8).
+        """
+        if np is None:
+            raise ImportError("moveRange nécessite NumPy.")
+        number = self._checkIndex(b, number, lambda n: (1 << n) - 1)
+        if not 0 <= a <= b:
+            raise ValueError(f"Intervalle de mouvements [{a}, {b}) invalide.")
+        # À partir de 63 disques, la fin de la solution n'est plus accessible par moveRange (voir movesFrom).
+        if b >= MAX_RANGE_INDEX:
+            raise ValueError(f"moveRange exige b < {MAX_RANGE_INDEX} (entiers de 64 bits), pas [{a}, {b}).")
+
+        m = np.arange(a + 1, b + 1, dtype=np.int64)
+        # Le bit le plus faible de m est une puissance de deux exacte:  frexp en donne l'exposant sans arrondi.
+        disk = np.frexp((m & -m).astype(np.float64))[1] - 1
+        j = m >> (disk + 1)
+
+        # cycles[parité de number - disque] donne le sens de rotation du disque (voir _cycle).
+        cycles = np.array([HanoiTowers._cycle(2, 0, start, finish), HanoiTowers._cycle(1, 0, start, finish)],
+                          dtype=np.uint8)
+        parity = (number - disk) & 1
+        return cycles[parity, j % 3], cycles[parity, (j + 1) % 3], disk.astype(np.uint8)
+
+    @staticmethod
+    def moveCode(start, finish):
+        """
+        Retourne le code d'un mouvement entre trois tours, soit son indice dans PEGPAIRS.
+        """
+        return 2 * start + finish - (finish > start)
+
+    def codeRange(self, a, b, number=None, start=0, finish=1):
+        """
+        Comme moveRange, mais retourne directement les codes des mouvements (voir moveCode) dans un seul tableau uint8.
+        """
+        s, f, _ = self.moveRange(a, b, number, start, finish)
+        return 2 * s + f - (f > s)
+
+    def iterMoveRange(self, a, b, number=None, start=0, finish=1, chunkSize=1 << 20):
+        """
+        Générateur qui découpe l'intervalle de mouvements [a, b) en blocs d'au plus chunkSize mouvements, calculés avec
+        moveRange.  La mémoire utilisée ne dépend que de chunkSize, même pour un très grand nombre de disques.
+
+        Args:
+            a (int):  Numéro du premier mouvement.
+            b (int):  Numéro qui suit le dernier mouvement, au plus 2**number - 1.
+            number (int):  Nombre de disques à transférer.  Par défaut, le nombre de disques du puzzle.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+            chunkSize (int):  Nombre maximal de mouvements par bloc.
+        Yields:
+            (ndarray, ndarray, ndarray):  Un bloc, comme retourné par moveRange.
+        """
+        for debut in range(a, b, chunkSize):
+            yield self.moveRange(debut, min(debut + chunkSize, b), number, start, finish)
+
+    @staticmethod
+    def _gatherChain(pegs, number, target):
+        """
+        Décisions nécessaires pour regrouper les disques 0 à number-1 de la configuration pegs sur la tour target, du plus
+        gros au plus petit:  chaque disque qui n'est pas déjà à sa place doit y aller directement, après que les disques
+        plus petits aient été regroupés sur la troisième tour.
+
+        Returns:
+            (liste de tuples, int):  Les décisions (disque, départ, arrivée, troisième tour), du plus gros disque au
+            plus petit, et le nombre total de mouvements nécessaires.
+        """
+        chain = []
+        total = 0
+        for disk in range(number - 1, -1, -1):
+            if pegs[disk] != target:
+                other = 3 - (pegs[disk] + target)
+                chain.append((disk, pegs[disk], target, other))
+                total += 1 << disk
+                target = other
+        return chain, total
+
+    @staticmethod
+    def _gatherMoves(chain):
+        """
+        Générateur des mouvements d'une chaîne de décisions de _gatherChain:  le plus petit disque de la chaîne bouge
+        en premier, puis les disques plus petits que lui sont retransférés par-dessus, et ainsi de suite.
+        """
+        for (disk, start, finish, other) in reversed(chain):
+            yield start, finish
+            yield from HanoiTowers.moves(disk, other, finish)
+
+    @staticmethod
+    def _scatterMoves(chain):
+        """
+        Générateur des mouvements inverses de _gatherMoves:  part de la tour regroupée pour atteindre la configuration
+        qui a servi à calculer la chaîne.
+        """
+        for (disk, start, finish, other) in chain:
+            yield from HanoiTowers.moves(disk, finish, other)
+            yield finish, start
+
+    @staticmethod
+    def _configurationPlan(source, target):
+        """
+        Plan optimal pour passer de la configuration source à la configuration target (3 tours).
+
+        Seuls les disques plus petits que le plus gros disque mal placé doivent bouger.  Ce disque va de a à b:  soit
+        directement (les plus petits attendent sur la troisième tour c), soit en deux temps par c (les plus petits
+        attendent d'abord sur b, puis sur a).  On compare les deux coûts en O(n) et on garde le meilleur.
+
+        Returns:
+            (int, liste de fonctions):  Nombre minimal de mouvements et étapes à enchaîner pour générer les mouvements.
+        """
+        if len(source) != len(target):
+            raise ValueError("Les deux configurations n'ont pas le même nombre de disques.")
+        disk = len(source) - 1
+        while disk >= 0 and source[disk] == target[disk]:
+            disk -= 1
+        if disk < 0:
+            return 0, []
+
+        a, b = source[disk], target[disk]
+        c = 3 - (a + b)
+        avant, coutAvant = HanoiTowers._gatherChain(source, disk, c)
+        apres, coutApres = HanoiTowers._gatherChain(target, disk, c)
+        direct = coutAvant + 1 + coutApres
+
+        avant2, coutAvant2 = HanoiTowers._gatherChain(source, disk, b)
+        apres2, coutApres2 = HanoiTowers._gatherChain(target, disk, a)
+        detour = coutAvant2 + 1 + ((1 << disk) - 1) + 1 + coutApres2
+
+        if direct <= detour:
+            return direct, [lambda: HanoiTowers._gatherMoves(avant),
+                            lambda: iter([(a, b)]),
+                            lambda: HanoiTowers._scatterMoves(apres)]
+        return detour, [lambda: HanoiTowers._gatherMoves(avant2),
+                        lambda: iter([(a, c)]),
+                        lambda: HanoiTowers.moves(disk, b, a),
+                        lambda: iter([(c, b)]),
+                        lambda: HanoiTowers._scatterMoves(apres2)]
+
+    @staticmethod
+    def configurationMoves(source, target):
+        """
+        Générateur de la plus courte suite de mouvements qui mène d'une configuration légale à une autre (3 tours).  La
+        décision se prend du plus gros disque au plus petit, en O(n), sans explorer les états possibles.
+
+        Args:
+            source (liste de int):  Configuration de départ:  l'élément d est la tour du disque d.
+            target (liste de int):  Configuration d'arrivée, de la même forme.
+        Yields:
+            (int, int):  Le couple (tour de départ, tour d'arrivée) de chaque mouvement.
+        """
+        for etape in HanoiTowers._configurationPlan(source, target)[1]:
+            yield from etape()
+
+    @staticmethod
+    def configurationDistance(source, target):
+        """
+        Retourne le nombre minimal de mouvements pour passer de la configuration source à la configuration target,
+        sans générer les mouvements.
+        """
+        return HanoiTowers._configurationPlan(source, target)[0]
+
+    def solveConfiguration(self, target=None, finish=1, callback=None):
+        """
+        Résout le puzzle à partir de l'état actuel des tours, quel qu'il soit (état sauvegardé, modifié à la main...).
+
+        Args:
+            target (liste de int):  Configuration à atteindre.  Par défaut, tous les disques sur la tour finish.
+            finish (int):  Tour d'arrivée lorsque target n'est pas donné.
+            callback (fonction):  Comme pour hanoiTransfer.  Si callback est None, on retourne un générateur.
+        """
+        if self.numberOfTowers != 3:
+            raise ValueError("La résolution à partir d'une configuration quelconque n'est possible qu'avec 3 tours.")
+        source = self.configuration()
+        if target is None:
+            target = [finish] * len(source)
+        mouvements = HanoiTowers.configurationMoves(source, target)
+        if self.stats is not None:
+            mouvements = self.stats.track(self, mouvements, len(source),
+                                          HanoiTowers.configurationDistance(source, target))
+        else:
+            mouvements = self._applyMoves(mouvements)
+        if callback is None:
+            return mouvements
+
+        for (s, f) in mouvements:
+            callback(s, f)
+
+    def _applyMoves(self, mouvements):
+        """
+        Générateur qui effectue chaque mouvement sur les tours avant de le retourner.
+        """
+        for (s, f) in mouvements:
+            self.transfer(s, f)
+            yield s, f
+
+    def iterTransfer(self, number, start, finish):
+        """
+        Générateur qui résout le problème des tours de Hanoi en effectuant chaque mouvement sur les tours avant de le
+        retourner.  On peut arrêter ou reprendre la résolution entre deux mouvements.
+
+        Args:
+            number (int):  Nombre de disques à transférer.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+        Yields:
+            (int, int):  Le couple (tour de départ, tour d'arrivée) du mouvement qui vient d'être effectué.
+        """
+        mouvements = self._solutionMoves(number, start, finish)
+        if self.stats is not None:
+            return self.stats.track(self, mouvements, number, self.minimumMoves(number))
+        return self._applyMoves(mouvements)
+
+    def _solutionMoves(self, number, start, finish):
+        """
+        Retourne le générateur des mouvements de la solution avec les tours du puzzle, sans modifier les tours.
+        """
+        if self.numberOfTowers == 3:
+            return HanoiTowers.moves(number, start, finish)
+        return HanoiTowers.frameStewartMoves(number, start, finish, self.numberOfTowers)
+
+    def minimumMoves(self, number=None):
+        """
+        Retourne le nombre de mouvements de la solution pour number disques avec les tours du puzzle.
+        """
+        if number is None:
+            number = self.number
+        return frameStewartTable(number, self.numberOfTowers)[0][self.numberOfTowers][number]
+
+    def instrument(self, stats=None, progress=None, progressInterval=1.0):
+        """
+        Active l'instrumentation des résolutions faites avec hanoiTransfer, iterTransfer, hanoiTransferBatch,
+        resumeTransfer ou solveConfiguration:  compteurs de mouvements et d'opérations par tour, temps par profondeur de
+        récurrence, histogramme de latence du callback et appel périodique de progress.  Une résolution par lots
+        instrumentée effectue chaque mouvement sur les tours, au lieu de calculer les lots directement;  le temps de
+        batchCallback y compte comme temps de callback, mais n'entre pas dans l'histogramme de latence.  Sans
+        instrumentation (stats à None), le seul coût est un test par résolution.
+
+        Args:
+            stats (objet HanoiStats):  Statistiques à alimenter.  Par défaut, un nouvel objet.
+            progress (fonction):  Appelée avec (mouvements faits, total, secondes restantes estimées).
+            progressInterval (float):  Temps minimal, en secondes, entre deux appels de progress.
+        Returns:
+            (objet HanoiStats):  Les statistiques, mises à jour au fur et à mesure de la résolution.
+        """
+        if stats is None:
+            stats = HanoiStats(progress, progressInterval)
+        self.stats = stats
+        return stats
+
+    def uninstrument(self):
+        """
+        Désactive l'instrumentation.
+        """
+        self.stats = None
+
+    def hanoiTransfer(self, number, start, finish, callback=None):
         """
         Ces quelques lignes de code sont le coeur du projet!!!
 
         Résout le problème des tours de Hanoi:  transfère tous les disques d'une tour vers une autre, en les gardant
-        constamment ordonnés.  Basé sur un algorithme récursif.
+        constamment ordonnés.  Basé sur l'algorithme récursif suivant:  transférer les n-1 disques du dessus sur la
+        tour libre, transférer le dernier disque sur la tour de destination, retransférer les n-1 disques de la tour
+        libre sur la tour destination.  (Voir la méthode moves pour la version sans appels récursifs.)
 
         Args:
             number (int):  Nombre de disques à transférer.  Si number=1 le problème est trivial.
             start (int):  Numéro de la tour de départ.
             finish (int):  Numéro de la tour d'arrivée.
             callback (fonction):  Fonction appelée à chaque fois qu'on bouge un disque.  Servira à interfacer avec un
-            contrôleur graphique, ou tout autre type de représentation.
+            contrôleur graphique, ou tout autre type de représentation.  Si callback est None, on retourne plutôt un
+            générateur des mouvements (voir iterTransfer).
         """
+        mouvements = self.iterTransfer(number, start, finish)
+        if callback is None:
+            return mouvements
 
-        # Numéro de la tour libre
-        other = abs(3 - (finish + start))
+        for (s, f) in mouvements:
+            callback(s, f)
 
-        # Transférer un seul disque:  on n'a qu'à le transférer.
-        if number == 1:
-            self.transfer(start, finish)
-            callback(start, finish)
+    def _codeBatches(self, number, start, finish, batchSize, direct):
+        """
+        Générateur des codes des mouvements (voir moveCode), par lots d'au plus batchSize, dans des array('B').  Si
+        direct est vrai (3 tours seulement), les tours ne sont pas modifiées:  c'est hanoiTransferBatch qui les place
+        dans l'état final.  Sinon, chaque mouvement est effectué (et instrumenté) au moment où il est généré, et le
+        code est s * (towers-1) + f - (f > s).  Instrumenté, c'est hanoiTransferBatch qui mesure le temps de
+        batchCallback.
+        """
+        if direct and np is not None:
+            for debut in range(0, (1 << number) - 1, batchSize):
+                lot = array('B')
+                lot.frombytes(self.codeRange(debut, min(debut + batchSize, (1 << number) - 1), number, start,
+                                             finish).tobytes())
+                yield lot
+            return
+
+        if direct:
+            mouvements = HanoiTowers.moves(number, start, finish)
+        elif self.stats is not None:
+            mouvements = self.stats.track(self, self._solutionMoves(number, start, finish), number,
+                                          self.minimumMoves(number), consumer=False)
+        else:
+            mouvements = self.iterTransfer(number, start, finish)
+        k = self.numberOfTowers - 1
+        codes = {(s, f): s * k + f - (f > s) for s in range(k + 1) for f in range(k + 1) if s != f}
+        # À partir de 17 tours, les codes ne tiennent plus dans un octet.
+        typecode = 'B' if (k + 1) * k <= 256 else 'H'
+        while True:
+            lot = array(typecode, map(codes.__getitem__, islice(mouvements, batchSize)))
+            if not lot:
+                return
+            yield lot
+
+    def hanoiTransferBatch(self, number, start, finish, batchCallback, batchSize=4096, format='tuples'):
+        """
+        Comme hanoiTransfer, mais les mouvements sont livrés par lots à batchCallback plutôt qu'un à la fois, ce qui
+        évite un appel de fonction par mouvement.  Si batchCallback retourne False, la résolution s'arrête après ce
+        lot.  À la fin, les tours sont dans l'état qui correspond aux mouvements livrés.
 
-        # Récurrence:  transférer les n-1 disques du dessus sur la tour libre, transférer le dernier disque sur la tour
-        # de destination, retransférer les n-1 disques de la tour libre sur la tour destination.
+        Args:
+            number (int):  Nombre de disques à transférer.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+            batchCallback (fonction):  Fonction appelée avec chaque lot de mouvements.
+            batchSize (int):  Nombre maximal de mouvements par lot.
+            format (str):  Forme des lots:  'tuples' (liste de couples (départ, arrivée)), 'array' (array('B') des
+            codes des mouvements, voir moveCode, ou array('H') à partir de 17 tours) ou 'memoryview' (memoryview de ces
+            codes, sans copie).
+        Returns:
+            (int):  Le nombre de mouvements livrés.
+        """
+        if format not in ('tuples', 'array', 'memoryview'):
+            raise ValueError(f"Format de lot inconnu:  {format}")
+        self._checkDisks(number)
+        if self.numberOfTowers == 3:
+            pairs = PEGPAIRS
         else:
-            self.hanoiTransfer(number - 1, start, other, callback)
-            self.hanoiTransfer(1, start, finish, callback)
-            self.hanoiTransfer(number-1, other, finish, callback)
+            pairs = [(s, f) for s in range(self.numberOfTowers) for f in range(self.numberOfTowers) if s != f]
+
+        # Les lots peuvent être calculés directement, et les tours placées dans l'état final à la fin, seulement si les
+        # number disques sont tous sur start et qu'aucun mouvement n'a à être contrôlé ou instrumenté.  Sinon, chaque
+        # mouvement est effectué par transfer.
+        direct = self.numberOfTowers == 3 and self.stats is None and self.check is None and \
+            self.configuration()[:number] == [start] * number
+        livres = 0
+        for lot in self._codeBatches(number, start, finish, batchSize, direct):
+            livres += len(lot)
+            if format == 'tuples':
+                lot = [pairs[c] for c in lot]
+            elif format == 'memoryview':
+                lot = memoryview(lot)
+            if self.stats is None:
+                arret = batchCallback(lot) is False
+            else:
+                # Le temps de batchCallback compte comme temps de callback, mais pas dans l'histogramme de latence,
+                # qui est par mouvement.
+                t0 = time.perf_counter_ns()
+                arret = batchCallback(lot) is False
+                self.stats.callbackTime += time.perf_counter_ns() - t0
+            if arret:
+                break
+
+        if direct:
+            self.seek(livres, number, start, finish)
+        return livres
+
+    def moveStream(self, number=None, start=0, finish=1, batchSize=4096, queueSize=8):
+        """
+        Retourne un itérateur asynchrone (asyncio) des mouvements de la solution, par lots de codes (voir moveCode).
+        Les lots passent par une file bornée à queueSize lots:  un consommateur lent ralentit la production au lieu de
+        la faire accumuler.  Les tours ne sont pas modifiées.  Voir le module hanoiasync.
+
+        Args:
+            number (int):  Nombre de disques à transférer.  Par défaut, le nombre de disques du puzzle.
+            start (int):  Numéro de la tour de départ.
+            finish (int):  Numéro de la tour d'arrivée.
+            batchSize (int):  Nombre de mouvements par lot.
+            queueSize (int):  Nombre maximal de lots en attente.
+        Returns:
+            (objet hanoiasync.MoveStream):  À parcourir avec async for, de préférence dans un bloc async with.
+        """
+        from hanoiasync import MoveStream, SharedSolution
+
+        if self.numberOfTowers != 3:
+            raise ValueError("Le flux de mouvements n'est possible qu'avec 3 tours.")
+        if number is None:
+            number = self.number
+        return MoveStream(SharedSolution(number, start, finish, batchSize), queueSize)
 
     def __str__(self):
         """
-        Représentation en mode texte des tours.  3 colonnes de chiffres, chaque chiffre identifie un disque.
-        """
-        texte = ""
-        formatData = [self.tour[i].count() for i in range(HanoiTowers.numberOfTowers)]
-        maxLength = max(formatData)
-        for i in range(maxLength):
-            for j in range(NTOWER):
-                offset = maxLength - formatData[j]
-                if offset <= i:
-                    texte += str(self.tour[j].getDisk()[i - offset])
-                else:
-                    texte += ' '
-                texte += " " * 10
-            texte += '\n'
-        return texte
+        Représentation en mode texte des tours.  Une colonne de chiffres par tour, chaque chiffre identifie un disque.
+        Voir le module hanoitext.
+        """
+        return renderTowers(self.tour)
 
 if __name__ == '__main__':
     moves = []
@@ -170,7 +1011,7 @@ if __name__ == '__main__':
     toursDeHanoi.hanoiTransfer(10, 0, 1, makeMovesList)
     print(moves)
     print(toursDeHanoi)
-    #print(toursDeHanoi.getMoves())
-    #for (s, f) in toursDeHanoi.hanoiTransfer(10, 0, 1):
-     #   print(f"Yields: {s} {f}")
+    for (s, f) in toursDeHanoi.hanoiTransfer(10, 1, 0):
+        print(f"Yields: {s} {f}")
+    print(toursDeHanoi)
 
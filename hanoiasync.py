@@ -0,0 +1,217 @@
+import asyncio
+import struct
+from array import array
+from collections import OrderedDict
+from itertools import islice
+
+import hanoi as ht
+
+
+class SharedSolution():
+    """État de génération partagé par plusieurs flux de mouvements d'un même problème (number, start, finish).  Les
+    mouvements sont découpés en lots de batchSize mouvements, chacun calculé directement à partir de son numéro (voir
+    HanoiTowers.codeRange et movesFrom), puis gardé dans un petit cache:  des clients qui lisent à peu près au même
+    endroit partagent les mêmes lots.
+
+    Attributs:
+    number(int):  Nombre de disques.
+    start, finish(int):  Tours de départ et d'arrivée.
+    batchSize(int):  Nombre de mouvements par lot.
+    cacheSize(int):  Nombre maximal de lots gardés en mémoire.
+    totalMoves(int):  Nombre total de mouvements."""
+
+    def __init__(self, number, start=0, finish=1, batchSize=4096, cacheSize=64):
+        self.number = number
+        self.start = start
+        self.finish = finish
+        self.batchSize = batchSize
+        self.cacheSize = cacheSize
+        self.totalMoves = (1 << number) - 1
+        self._puzzle = ht.HanoiTowers(number)
+        self._cache = OrderedDict()
+
+    def batchCount(self):
+        """Nombre de lots."""
+        return -(-self.totalMoves // self.batchSize)
+
+    def batch(self, i):
+        """Retourne le lot i:  les codes (voir HanoiTowers.moveCode) des mouvements i * batchSize et suivants.
+        Returns:
+            (bytes):  Un octet par mouvement."""
+        lot = self._cache.get(i)
+        if lot is not None:
+            self._cache.move_to_end(i)
+            return lot
+
+        debut = i * self.batchSize
+        fin = min(debut + self.batchSize, self.totalMoves)
+        if ht.np is not None:
+            lot = self._puzzle.codeRange(debut, fin, self.number, self.start, self.finish).tobytes()
+        else:
+            mouvements = self._puzzle.movesFrom(debut, self.number, self.start, self.finish)
+            lot = array('B', (ht.HanoiTowers.moveCode(s, f) for (s, f) in islice(mouvements, fin - debut))).tobytes()
+        self._cache[i] = lot
+        if len(self._cache) > self.cacheSize:
+            self._cache.popitem(last=False)
+        return lot
+
+
+class MoveStream():
+    """Itérateur asynchrone des lots de mouvements d'une solution.  Une tâche productrice calcule les lots et les dépose
+    dans une file bornée (queueSize lots):  si le consommateur est lent, la production attend au lieu d'accumuler des
+    lots, et elle rend la main à la boucle d'événements après chaque lot.  Le parcours est un générateur asynchrone qui
+    arrête la tâche productrice en sortant:  à la fin des lots, à l'appel de aclose (ou à la sortie d'un bloc async
+    with), ou, si le consommateur abandonne le parcours sans rien appeler, quand asyncio finalise le générateur.
+
+        async with HanoiTowers(20).moveStream() as flux:
+            async for lot in flux:
+                ...
+
+    Attributs:
+    solution(objet SharedSolution):  Source des lots, qui peut être partagée par plusieurs flux.
+    queueSize(int):  Nombre maximal de lots en attente."""
+
+    def __init__(self, solution, queueSize=8):
+        self.solution = solution
+        self.queueSize = queueSize
+        self._lots = None
+
+    @staticmethod
+    async def _produce(solution, queue):
+        """Tâche productrice:  dépose les lots dans la file, puis None à la fin.  Elle ne garde aucune référence au
+        flux, pour que le générateur d'un parcours abandonné puisse être finalisé."""
+        for i in range(solution.batchCount()):
+            await queue.put(solution.batch(i))
+            await asyncio.sleep(0)
+        await queue.put(None)
+
+    async def _iterate(self):
+        """Générateur asynchrone des lots, qui démarre la tâche productrice et l'arrête en sortant."""
+        queue = asyncio.Queue(maxsize=self.queueSize)
+        producteur = asyncio.ensure_future(MoveStream._produce(self.solution, queue))
+        try:
+            while True:
+                lot = await queue.get()
+                if lot is None:
+                    return
+                yield lot
+        finally:
+            if not producteur.done():
+                producteur.cancel()
+                try:
+                    await producteur
+                except asyncio.CancelledError:
+                    pass
+
+    def __aiter__(self):
+        if self._lots is None:
+            self._lots = self._iterate()
+        return self._lots
+
+    async def __anext__(self):
+        return await self.__aiter__().__anext__()
+
+    async def aclose(self):
+        """Arrête la production, par exemple si le client se déconnecte."""
+        if self._lots is not None:
+            await self._lots.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exception):
+        await self.aclose()
+
+
+class MoveServer():
+    """Petit serveur TCP qui envoie des solutions à plusieurs clients en même temps, dans un seul processus.
+
+    Protocole:  le client envoie une ligne "number start finish".  Le serveur répond avec le nombre de mouvements (8
+    octets, petit-boutiste), puis les codes des mouvements, un octet par mouvement (l'indice dans hanoi.PEGPAIRS).
+    Les clients qui demandent le même problème partagent un même objet SharedSolution.
+
+    Attributs:
+    maxDisks(int):  Nombre maximal de disques accepté.
+    batchSize(int):  Nombre de mouvements par lot.
+    queueSize(int):  Nombre maximal de lots en attente par client."""
+
+    maxDisks = 40
+
+    def __init__(self, batchSize=4096, queueSize=8):
+        self.batchSize = batchSize
+        self.queueSize = queueSize
+        self.solutions = {}
+        self.clients = 0
+
+    def solution(self, number, start, finish):
+        """Retourne l'objet SharedSolution du problème, en le créant au besoin."""
+        cle = (number, start, finish)
+        if cle not in self.solutions:
+            self.solutions[cle] = SharedSolution(number, start, finish, self.batchSize)
+        return self.solutions[cle]
+
+    async def handle(self, reader, writer):
+        """Sert un client:  lit la demande, puis envoie les lots en respectant le rythme du client (drain)."""
+        self.clients += 1
+        flux = None
+        try:
+            try:
+                number, start, finish = (int(x) for x in (await reader.readline()).split())
+            except ValueError:
+                return
+            if not 0 <= number <= MoveServer.maxDisks or {start, finish} - {0, 1, 2} or start == finish:
+                return
+            solution = self.solution(number, start, finish)
+            writer.write(struct.pack('<Q', solution.totalMoves))
+            flux = MoveStream(solution, self.queueSize)
+            async for lot in flux:
+                writer.write(lot)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if flux is not None:
+                await flux.aclose()
+            self.clients -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Démarre le serveur.
+        Returns:
+            (objet asyncio.Server):  Le serveur démarré;  son port est server.sockets[0].getsockname()[1]."""
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def fetchMoves(host, port, number, start=0, finish=1):
+    """Client simple:  demande une solution au serveur et retourne les codes reçus.
+    Returns:
+        (bytes):  Un octet par mouvement."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"{number} {start} {finish}\n".encode())
+    await writer.drain()
+    total = struct.unpack('<Q', await reader.readexactly(8))[0]
+    codes = await reader.readexactly(total)
+    writer.close()
+    await writer.wait_closed()
+    return codes
+
+
+if __name__ == '__main__':
+    import time
+
+    async def demo(clients, number):
+        serveur = await MoveServer().start()
+        port = serveur.sockets[0].getsockname()[1]
+        debut = time.perf_counter()
+        resultats = await asyncio.gather(*(fetchMoves('127.0.0.1', port, number) for _ in range(clients)))
+        duree = time.perf_counter() - debut
+        serveur.close()
+        await serveur.wait_closed()
+        total = sum(len(r) for r in resultats)
+        print(f"{clients} clients, {total} coups reçus en {duree:.2f} s")
+
+    asyncio.run(demo(1000, 14))
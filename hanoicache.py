@@ -0,0 +1,133 @@
+from collections import OrderedDict
+
+import hanoi as ht
+
+
+def relabelTable(mapping):
+    """Table de traduction (pour bytes.translate) des codes de mouvement quand on renomme les tours.
+    Args:
+        mapping(tuple de int):  mapping[p] est le nouveau numéro de la tour p.
+    Returns:
+        (bytes):  256 octets;  l'octet c est le code du mouvement c après renommage."""
+    table = bytearray(range(256))
+    for (c, (a, b)) in enumerate(ht.PEGPAIRS):
+        table[c] = ht.HanoiTowers.moveCode(mapping[a], mapping[b])
+    return bytes(table)
+
+
+def _mapping(start, finish):
+    """Renommage qui envoie la solution canonique (0 vers 1, tour libre 2) sur la solution de start vers finish."""
+    return start, finish, 3 - (start + finish)
+
+
+# Pour construire la solution canonique de n disques à partir de celle de n-1:  n-1 disques de 0 vers 2, le plus gros
+# disque de 0 vers 1, puis n-1 disques de 2 vers 1.
+_FIRST_HALF = relabelTable(_mapping(0, 2))
+_SECOND_HALF = relabelTable(_mapping(2, 1))
+_MIDDLE = bytes([ht.HanoiTowers.moveCode(0, 1)])
+
+
+class RelabeledMoves():
+    """Vue en lecture seule d'une solution conservée dans SolutionCache:  les codes canoniques ne sont pas copiés, le
+    renommage des tours se fait à la lecture de chaque mouvement.
+
+    Attributs:
+    number(int):  Nombre de disques.
+    start, finish(int):  Tours de départ et d'arrivée."""
+
+    def __init__(self, codes, table, number, start, finish):
+        self._codes = memoryview(codes)
+        self._table = table
+        self.number = number
+        self.start = start
+        self.finish = finish
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __getitem__(self, k):
+        """view[k] retourne le couple (tour de départ, tour d'arrivée) du mouvement k, view[a:b] une autre vue."""
+        if isinstance(k, slice):
+            return RelabeledMoves(self._codes[k], self._table, self.number, self.start, self.finish)
+        return ht.PEGPAIRS[self._table[self._codes[k]]]
+
+    def __iter__(self):
+        pairs, table = ht.PEGPAIRS, self._table
+        return (pairs[table[c]] for c in self._codes)
+
+    def tobytes(self):
+        """Retourne une copie des codes, après renommage."""
+        return self._codes.tobytes().translate(self._table)
+
+
+class SolutionCache():
+    """Cache des solutions optimales (3 tours).  Une seule suite est conservée par nombre de disques, celle de la tour 0
+    vers la tour 1:  toutes les autres s'en déduisent en renommant les tours (voir RelabeledMoves).  La suite de n
+    disques se construit à partir de celle de n-1, qu'on prend dans le cache si possible.  Les suites les moins
+    récemment utilisées sont retirées dès que le total dépasse maxBytes.
+
+    Attributs:
+    maxBytes(int):  Taille maximale du cache, en octets (un octet par mouvement).
+    hits, misses, evictions(int):  Statistiques d'utilisation."""
+
+    def __init__(self, maxBytes=64 << 20):
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sequences = OrderedDict()
+        self._bytes = 0
+
+    def _store(self, number, codes):
+        """Ajoute une suite au cache, puis retire les plus anciennes au besoin.  Une suite plus grosse que tout le cache
+        n'est pas conservée."""
+        if len(codes) > self.maxBytes:
+            return
+        self._sequences[number] = codes
+        self._bytes += len(codes)
+        while self._bytes > self.maxBytes:
+            _, ancien = self._sequences.popitem(last=False)
+            self._bytes -= len(ancien)
+            self.evictions += 1
+
+    def canonical(self, number):
+        """Retourne les codes de la solution de number disques de la tour 0 vers la tour 1.
+        Returns:
+            (bytes):  Un octet par mouvement."""
+        codes = self._sequences.get(number)
+        if codes is not None:
+            self.hits += 1
+            self._sequences.move_to_end(number)
+            return codes
+        self.misses += 1
+
+        # Partir de la plus grande suite déjà en cache sous number.
+        m = max((k for k in self._sequences if k < number), default=0)
+        codes = b""
+        if m:
+            codes = self._sequences[m]
+            self._sequences.move_to_end(m)
+        for k in range(m + 1, number + 1):
+            codes = codes.translate(_FIRST_HALF) + _MIDDLE + codes.translate(_SECOND_HALF)
+            if k >= number - 1:
+                self._store(k, codes)
+        return codes
+
+    def get(self, number, start=0, finish=1):
+        """Retourne la solution de number disques de start vers finish, sans copie.
+        Returns:
+            (objet RelabeledMoves):  Vue sur la suite canonique."""
+        if start not in (0, 1, 2) or finish not in (0, 1, 2) or start == finish:
+            raise ValueError(f"Tours invalides:  {start} -> {finish}")
+        return RelabeledMoves(self.canonical(number), relabelTable(_mapping(start, finish)), number, start, finish)
+
+    def stats(self):
+        """Retourne les statistiques du cache."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._sequences),
+            'bytes': self._bytes,
+            'maxBytes': self.maxBytes,
+        }
@@ -0,0 +1,196 @@
+import os
+import random
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import hanoi as ht
+import hanoigeometry as geo
+
+
+class FrameRenderer():
+    """Rendu sans affichage de l'animation de tkhanoi, image par image, dans un tampon RGB.  Les règles de géométrie
+    sont celles de hanoigeometry (rayon selon le numéro du disque, position des disques dans la pile, hauteur de
+    glissement), mises à l'échelle de l'image:  les hauteurs suivent height, les rayons suivent width et l'écart entre
+    les piles, et les disques sont amincis au besoin pour que la pile complète passe sous la hauteur de glissement.
+
+    Chaque image se calcule indépendamment à partir de son numéro:  l'image f montre le mouvement f // framesPerMove,
+    avancé d'une fraction (f % framesPerMove) / framesPerMove, et l'état des autres disques vient de
+    HanoiTowers.stateAt.  On peut donc répartir les images entre plusieurs processus (voir exportFrames).
+
+    Attributs:
+    number(int):  Nombre de disques.
+    width, height(int):  Taille des images, en pixels.
+    framesPerMove(int):  Nombre d'images par mouvement.
+    start, finish(int):  Tours de départ et d'arrivée.
+    stackX(tuple de int):  Abcisse du centre de chaque pile.
+    baseOffset, slidingHeight(float):  Hauteur de la base des piles et hauteur de glissement, à partir du bas.
+    diskHeight(float):  Demi-hauteur d'un disque.
+    minRadius, maxRadius(float):  Rayons du plus petit et du plus grand disque."""
+
+    background = (255, 255, 255)
+
+    def __init__(self, number, width=1000, height=500, framesPerMove=8, start=0, finish=1, stackX=(250, 500, 750)):
+        self.number = number
+        self.width = width
+        self.height = height
+        self.framesPerMove = framesPerMove
+        self.start = start
+        self.finish = finish
+        self.stackX = stackX
+        echelle = height / geo.CANVAS_HEIGHT
+        self.baseOffset = geo.BASE_OFFSET * echelle
+        self.slidingHeight = geo.SLIDING_HEIGHT * echelle
+        self.diskHeight = geo.DISK_HEIGHT * echelle
+        if number:
+            self.diskHeight = min(self.diskHeight, (self.slidingHeight - self.baseOffset) / (2 * number))
+        if self.diskHeight < 0.5:
+            raise ValueError(f"{number} disques ne tiennent pas dans une image de {height} pixels de haut.")
+        ecart = min((abs(b - a) for (a, b) in zip(stackX, stackX[1:])), default=width)
+        self.maxRadius = min(geo.MAX_RADIUS * width / geo.CANVAS_WIDTH, ecart / 2)
+        self.minRadius = self.maxRadius * geo.MIN_RADIUS / geo.MAX_RADIUS
+        self.puzzle = ht.HanoiTowers(number)
+        self.totalMoves = (1 << number) - 1
+        self.colors = [bytes(random.Random(d).randrange(0x111111, 0xFFFFFF).to_bytes(3, 'big'))
+                       for d in range(number)]
+        self._background = bytes(FrameRenderer.background) * (width * height)
+
+    def frameCount(self):
+        """Nombre total d'images:  framesPerMove par mouvement, plus l'image finale."""
+        return self.totalMoves * self.framesPerMove + 1
+
+    def _slotY(self, index):
+        """Ordonnée (y vers le bas) du centre d'un disque à la position index d'une pile."""
+        return self.height - geo.slotHeight(index, self.baseOffset, self.diskHeight)
+
+    def _movingPosition(self, stackStart, slotStart, stackFinish, slotFinish, fraction):
+        """Position du disque en mouvement, à une fraction de la longueur de son trajet:  monter, glisser, descendre,
+        comme StackOfDisks.path de tkhanoi."""
+        yHaut = self.height - self.slidingHeight
+        points = [(self.stackX[stackStart], self._slotY(slotStart)), (self.stackX[stackStart], yHaut),
+                  (self.stackX[stackFinish], yHaut), (self.stackX[stackFinish], self._slotY(slotFinish))]
+        longueurs = [abs(x1 - x0) + abs(y1 - y0) for ((x0, y0), (x1, y1)) in zip(points, points[1:])]
+        distance = fraction * sum(longueurs)
+        for ((x0, y0), (x1, y1)), longueur in zip(zip(points, points[1:]), longueurs):
+            if distance <= longueur and longueur:
+                t = distance / longueur
+                return x0 + t * (x1 - x0), y0 + t * (y1 - y0)
+            distance -= longueur
+        return points[-1]
+
+    def _fillRect(self, pixels, x0, y0, x1, y1, color):
+        """Remplit un rectangle de l'image, limité aux bords."""
+        x0, x1 = max(int(round(x0)), 0), min(int(round(x1)), self.width)
+        y0, y1 = max(int(round(y0)), 0), min(int(round(y1)), self.height)
+        if x0 >= x1:
+            return
+        ligne = color * (x1 - x0)
+        for y in range(y0, y1):
+            debut = 3 * (y * self.width + x0)
+            pixels[debut:debut + len(ligne)] = ligne
+
+    def render(self, frame):
+        """Calcule une image.
+        Args:
+            frame(int):  Numéro de l'image, entre 0 et frameCount() - 1.
+        Returns:
+            (bytearray):  Pixels RGB, ligne par ligne à partir du haut."""
+
+        k, pas = divmod(frame, self.framesPerMove)
+        if k >= self.totalMoves:
+            k, pas = self.totalMoves, 0
+        pegs = self.puzzle.stateAt(k, self.number, self.start, self.finish)
+
+        pixels = bytearray(self._background)
+        hauteur = self.diskHeight
+        piles = [[] for _ in self.stackX]
+        for d in range(self.number - 1, -1, -1):
+            piles[pegs[d]].append(d)
+
+        # Le disque en mouvement est celui du dessus de la pile de départ.
+        mobile = None
+        if pas:
+            s, f = self.puzzle.moveAt(k, self.number, self.start, self.finish)
+            mobile = piles[s].pop()
+            x, y = self._movingPosition(s, len(piles[s]), f, len(piles[f]), pas / self.framesPerMove)
+
+        for (tour, pile) in enumerate(piles):
+            for (i, d) in enumerate(pile):
+                r = geo.radiusOf(d, self.number, self.minRadius, self.maxRadius)
+                yc = self._slotY(i)
+                self._fillRect(pixels, self.stackX[tour] - r, yc - hauteur, self.stackX[tour] + r, yc + hauteur,
+                               self.colors[d])
+        if mobile is not None:
+            r = geo.radiusOf(mobile, self.number, self.minRadius, self.maxRadius)
+            self._fillRect(pixels, x - r, y - hauteur, x + r, y + hauteur, self.colors[mobile])
+        return pixels
+
+    def write(self, path, pixels):
+        """Écrit une image:  PNG si path se termine par .png, sinon PPM binaire (P6)."""
+        with open(path, 'wb') as f:
+            if path.lower().endswith('.png'):
+                f.write(encodePNG(pixels, self.width, self.height))
+            else:
+                f.write(b"P6\n%d %d\n255\n" % (self.width, self.height))
+                f.write(pixels)
+
+
+def encodePNG(pixels, width, height):
+    """Encode des pixels RGB en PNG, avec zlib seulement.
+    Returns:
+        (bytes):  Contenu du fichier PNG."""
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    largeur = 3 * width
+    brut = b''.join(b'\x00' + bytes(pixels[y * largeur:(y + 1) * largeur]) for y in range(height))
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(brut, 6))
+            + chunk(b'IEND', b''))
+
+
+def _renderRange(options, directory, extension, debut, fin):
+    """Travail d'un processus:  calcule et écrit les images debut à fin - 1."""
+    renderer = FrameRenderer(**options)
+    for frame in range(debut, fin):
+        renderer.write(os.path.join(directory, f"frame{frame:06d}.{extension}"), renderer.render(frame))
+    return fin - debut
+
+
+def exportFrames(number, directory, extension='ppm', workers=None, **options):
+    """Écrit toutes les images de l'animation dans directory (frame000000.ppm, frame000001.ppm, ...), en répartissant
+    les images entre plusieurs processus.
+
+    Args:
+        number(int):  Nombre de disques.
+        directory(str):  Répertoire de destination, créé au besoin.
+        extension(str):  'ppm' ou 'png'.
+        workers(int):  Nombre de processus.  Par défaut, le nombre de processeurs.
+        **options:  Autres paramètres de FrameRenderer (width, height, framesPerMove, start, finish, stackX).
+    Returns:
+        (int):  Nombre d'images écrites."""
+
+    os.makedirs(directory, exist_ok=True)
+    options['number'] = number
+    total = FrameRenderer(**options).frameCount()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    taille = max(1, -(-total // (4 * workers)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        travaux = [executor.submit(_renderRange, options, directory, extension, debut, min(debut + taille, total))
+                   for debut in range(0, total, taille)]
+        return sum(travail.result() for travail in travaux)
+
+
+if __name__ == '__main__':
+    import sys
+    import tempfile
+    import time
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    destination = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.gettempdir(), f"hanoi{n}")
+    debut = time.perf_counter()
+    images = exportFrames(n, destination, width=500, height=250, framesPerMove=4, stackX=(125, 250, 375))
+    print(f"{images} images dans {destination} en {time.perf_counter() - debut:.1f} s")
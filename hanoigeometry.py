@@ -0,0 +1,33 @@
+# Géométrie de l'animation, partagée par tkhanoi (affichage Tk) et hanoiframes (rendu sans affichage).  Les distances
+# sont en pixels, les hauteurs mesurées à partir du rebord inférieur, pour un canvas de CANVAS_WIDTH par CANVAS_HEIGHT.
+CANVAS_WIDTH = 1000
+CANVAS_HEIGHT = 500
+MAX_RADIUS = 100
+MIN_RADIUS = 10
+BASE_OFFSET = 50
+DISK_HEIGHT = 10
+SLIDING_HEIGHT = 350
+
+
+def radiusOf(disk, total, minRadius=MIN_RADIUS, maxRadius=MAX_RADIUS):
+    """Règle qui donne le rayon d'un disque à partir de son numéro dans le puzzle (0 étant le plus petit).
+    Args:
+        disk(int):  Numéro du disque.
+        total(int):  Nombre total de disques.
+        minRadius, maxRadius(float):  Rayons du plus petit et du plus grand disque.
+    Returns:
+        (float):  Rayon du disque, compris entre minRadius et maxRadius."""
+    if total <= 1:
+        return maxRadius
+    return minRadius + disk * (maxRadius - minRadius) / (total - 1)
+
+
+def slotHeight(index, baseOffset=BASE_OFFSET, diskHeight=DISK_HEIGHT):
+    """Règle qui donne la hauteur du centre du disque à la position index d'une pile (0 étant le bas).
+    Args:
+        index(int):  Position dans la pile.
+        baseOffset(float):  Hauteur de la base de la pile.
+        diskHeight(float):  Demi-hauteur d'un disque.
+    Returns:
+        (float):  Hauteur du centre du disque."""
+    return baseOffset + diskHeight * (2*index + 1)
@@ -0,0 +1,226 @@
+import mmap
+import struct
+
+import hanoi as ht
+
+# En-tête du fichier:  signature, version, nombre de tours, tour de départ, tour d'arrivée, nombre de disques, nombre
+# de bits par mouvement et nombre de mouvements.
+HEADER = struct.Struct('<4sBBBBHBxQ')
+MAGIC = b'HNOI'
+VERSION = 1
+
+# Taille des blocs lus à la fois par le parcours séquentiel d'un MoveLog.
+READ_SIZE = 1 << 16
+
+
+def bitsPerMove(towers):
+    """Nombre de bits nécessaires pour coder un mouvement entre towers tours:  il y a towers * (towers-1) couples
+    (départ, arrivée) possibles, donc 3 bits pour 3 tours."""
+    return max(1, (towers * (towers - 1) - 1).bit_length())
+
+
+def movePairs(towers):
+    """Table de décodage:  l'élément c est le couple (départ, arrivée) du mouvement de code c.  Pour 3 tours, c'est
+    hanoi.PEGPAIRS."""
+    pairs = []
+    for start in range(towers):
+        pairs.extend((start, finish) for finish in range(towers) if finish != start)
+    return tuple(pairs)
+
+
+def _spanBytes(bits):
+    """Nombre d'octets à lire pour être certain d'obtenir un mouvement complet, peu importe où il commence."""
+    return (bits + 7 + 7) // 8
+
+
+class MoveLogWriter():
+    """Écrit une suite de mouvements dans un fichier binaire compact, au fur et à mesure:  chaque mouvement occupe
+    bitsPerMove(towers) bits (3 bits pour 3 tours).  La méthode write a la même signature que le callback de
+    hanoiTransfer, on peut donc l'utiliser directement:
+
+        with MoveLogWriter("solution.hnoi", 20) as log:
+            HanoiTowers(20).hanoiTransfer(20, 0, 1, log.write)
+
+    Attributs:
+    number(int):  Nombre de disques.
+    towers(int):  Nombre de tours.
+    start(int):  Numéro de la tour de départ.
+    finish(int):  Numéro de la tour d'arrivée.
+    count(int):  Nombre de mouvements écrits jusqu'à maintenant."""
+
+    bufferSize = 1 << 16
+
+    def __init__(self, path, number, towers=ht.NTOWER, start=0, finish=1):
+        self.number = number
+        self.towers = towers
+        self.start = start
+        self.finish = finish
+        self.count = 0
+        self.bits = bitsPerMove(towers)
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, towers, start, finish, number, self.bits, 0))
+        self._buffer = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, start, finish):
+        """Ajoute un mouvement au fichier.
+        Args:
+            start(int):  Numéro de la tour de départ.
+            finish(int):  Numéro de la tour d'arrivée."""
+        self.writeCode(start * (self.towers - 1) + finish - (finish > start))
+
+    def writeCode(self, code):
+        """Ajoute un mouvement déjà codé (pour 3 tours, c'est son indice dans hanoi.PEGPAIRS)."""
+        self._acc |= code << self._nbits
+        self._nbits += self.bits
+        while self._nbits >= 8:
+            self._buffer.append(self._acc & 0xFF)
+            self._acc >>= 8
+            self._nbits -= 8
+        self.count += 1
+        if len(self._buffer) >= MoveLogWriter.bufferSize:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def close(self):
+        """Complète le dernier octet, ajoute le remplissage nécessaire à la lecture et inscrit le nombre de mouvements
+        dans l'en-tête."""
+        if self._file.closed:
+            return
+        if self._nbits:
+            self._buffer.append(self._acc & 0xFF)
+        self._buffer.extend(bytes(_spanBytes(self.bits)))
+        self._file.write(self._buffer)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.towers, self.start, self.finish, self.number, self.bits,
+                                     self.count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MoveLog():
+    """Lecture d'un fichier écrit par MoveLogWriter.  Le fichier est projeté en mémoire (mmap):  rien n'est chargé
+    d'avance, et on peut accéder à n'importe quel mouvement, parcourir les mouvements (bloc par bloc) ou en extraire une
+    tranche sans copie.  Une tranche (log[a:b]) est un autre objet MoveLog qui partage la même projection.
+
+    Attributs:
+    number(int):  Nombre de disques.
+    towers(int):  Nombre de tours.
+    start(int):  Numéro de la tour de départ.
+    finish(int):  Numéro de la tour d'arrivée.
+    bits(int):  Nombre de bits par mouvement."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.towers, self.start, self.finish, self.number, self.bits, count = \
+            HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} n'est pas un fichier de mouvements valide.")
+        self._indices = range(count)
+        self._pairs = movePairs(self.towers)
+
+    def _view(self, indices):
+        """Nouvel objet MoveLog qui partage la projection, restreint aux mouvements indices."""
+        view = object.__new__(MoveLog)
+        view.__dict__.update(self.__dict__)
+        view._indices = indices
+        return view
+
+    def code(self, k):
+        """Retourne le code du mouvement k du fichier (sans tenir compte des tranches)."""
+        bit = k * self.bits
+        debut = HEADER.size + (bit >> 3)
+        valeur = int.from_bytes(self._mmap[debut:debut + _spanBytes(self.bits)], 'little')
+        return (valeur >> (bit & 7)) & ((1 << self.bits) - 1)
+
+    def codes(self, a=0, b=None):
+        """Retourne les codes des mouvements a (inclus) à b (exclu) de la vue, un par élément.  Avec NumPy, le décodage
+        des bits est vectorisé et le résultat est un tableau uint8;  sinon, c'est un objet bytes (pour 8 bits par
+        mouvement ou moins).  Avec plus de 8 bits par mouvement, le tableau NumPy est en uint32.
+        Args:
+            a(int):  Indice du premier mouvement dans la vue.
+            b(int):  Indice qui suit le dernier mouvement.  Par défaut, la fin de la vue."""
+        indices = self._indices[a:b]
+        if indices.step != 1 or ht.np is None:
+            return bytes(self.code(k) for k in indices)
+
+        np = ht.np
+        bit = indices.start * self.bits
+        debut = HEADER.size + (bit >> 3)
+        fin = HEADER.size + ((indices.stop * self.bits + 7) >> 3)
+        bits = np.unpackbits(np.frombuffer(self._mmap[debut:fin], dtype=np.uint8), bitorder='little')
+        bits = bits[bit & 7:(bit & 7) + len(indices) * self.bits].reshape(-1, self.bits)
+        type = np.uint8 if self.bits <= 8 else np.uint32
+        poids = np.left_shift(1, np.arange(self.bits, dtype=type))
+        return (bits * poids).sum(axis=1, dtype=type)
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, k):
+        """log[k] retourne le couple (tour de départ, tour d'arrivée) du mouvement k, log[a:b] une tranche."""
+        if isinstance(k, slice):
+            return self._view(self._indices[k])
+        return self._pairs[self.code(self._indices[k])]
+
+    def __iter__(self):
+        """Parcours séquentiel, octet par octet, plus rapide que des accès individuels.  Le fichier est lu par blocs de
+        READ_SIZE octets:  seul le bloc en cours est copié en mémoire."""
+        if self._indices.step != 1:
+            yield from (self._pairs[self.code(k)] for k in self._indices)
+            return
+
+        bits, masque, pairs = self.bits, (1 << self.bits) - 1, self._pairs
+        restant = len(self._indices)
+        if restant == 0:
+            return
+        bit = self._indices.start * bits
+        debut = HEADER.size + (bit >> 3)
+        fin = HEADER.size + ((self._indices.stop * bits + 7) >> 3)
+        acc, nbits = 0, -(bit & 7)
+        for bloc in range(debut, fin, READ_SIZE):
+            for octet in self._mmap[bloc:min(bloc + READ_SIZE, fin)]:
+                if nbits < 0:
+                    acc, nbits = octet >> -nbits, 8 + nbits
+                else:
+                    acc |= octet << nbits
+                    nbits += 8
+                while nbits >= bits:
+                    yield pairs[acc & masque]
+                    acc >>= bits
+                    nbits -= bits
+                    restant -= 1
+                    if restant == 0:
+                        return
+
+    def close(self):
+        """Ferme la projection en mémoire, partagée avec toutes les tranches."""
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+
+    n = 20
+    chemin = os.path.join(tempfile.gettempdir(), f"hanoi{n}.hnoi")
+    with MoveLogWriter(chemin, n) as log:
+        ht.HanoiTowers(n).hanoiTransfer(n, 0, 1, log.write)
+    print(f"{log.count} coups, {os.path.getsize(chemin)} octets")
+
+    with MoveLog(chemin) as log:
+        print(log[0], log[len(log) // 2], list(log[-3:]))
@@ -0,0 +1,109 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import hanoi as ht
+
+
+class PackedMoves():
+    """Suite de mouvements conservée sous forme compacte:  un octet par mouvement, qui est le code du mouvement (indice
+    dans hanoi.PEGPAIRS).  C'est ce que retourne parallelSolve.
+
+    Attributs:
+    codes(bytes):  Codes des mouvements, dans l'ordre.
+    number(int):  Nombre de disques transférés.
+    start(int):  Numéro de la tour de départ.
+    finish(int):  Numéro de la tour d'arrivée."""
+
+    def __init__(self, codes, number, start, finish):
+        self.codes = codes
+        self.number = number
+        self.start = start
+        self.finish = finish
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, k):
+        """Retourne le couple (tour de départ, tour d'arrivée) du mouvement k."""
+        return ht.PEGPAIRS[self.codes[k]]
+
+    def __iter__(self):
+        pairs = ht.PEGPAIRS
+        return (pairs[c] for c in self.codes)
+
+    def replay(self, puzzle, callback=None):
+        """Effectue tous les mouvements sur un objet HanoiTowers, par exemple pour vérifier le résultat avec valid().
+        Args:
+            puzzle(objet HanoiTowers):  Puzzle sur lequel rejouer les mouvements.
+            callback(fonction):  Fonction optionnelle appelée après chaque mouvement, comme pour hanoiTransfer.
+        Returns:
+            (objet HanoiTowers):  Le puzzle, après les mouvements."""
+        for (s, f) in self:
+            puzzle.transfer(s, f)
+            if callback is not None:
+                callback(s, f)
+        return puzzle
+
+
+def _solveRange(name, number, start, finish, a, b, chunkSize):
+    """Travail d'un processus:  calcule les mouvements [a, b) et écrit leurs codes directement dans la mémoire partagée
+    name.  Rien n'est retourné au processus principal, sauf le nombre de mouvements écrits."""
+
+    memoire = shared_memory.SharedMemory(name=name)
+    try:
+        puzzle = ht.HanoiTowers(0)
+        for debut in range(a, b, chunkSize):
+            fin = min(debut + chunkSize, b)
+            memoire.buf[debut:fin] = puzzle.codeRange(debut, fin, number, start, finish).tobytes()
+    finally:
+        memoire.close()
+    return b - a
+
+
+def parallelSolve(number, start=0, finish=1, workers=None, chunkSize=1 << 20):
+    """Calcule tous les mouvements de la solution avec un groupe de processus.  Les 2**number - 1 mouvements sont
+    répartis en intervalles égaux:  comme chaque mouvement se calcule à partir de son numéro (HanoiTowers.moveRange), les
+    processus sont indépendants et écrivent dans un même tampon en mémoire partagée.  Nécessite NumPy.
+
+    Args:
+        number(int):  Nombre de disques à transférer.
+        start(int):  Numéro de la tour de départ.
+        finish(int):  Numéro de la tour d'arrivée.
+        workers(int):  Nombre de processus.  Par défaut, le nombre de processeurs.
+        chunkSize(int):  Nombre de mouvements calculés à la fois dans chaque processus.
+    Returns:
+        (objet PackedMoves):  Les mouvements de la solution."""
+
+    total = (1 << number) - 1
+    if total <= 0:
+        return PackedMoves(b"", number, start, finish)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    memoire = shared_memory.SharedMemory(create=True, size=total)
+    try:
+        taille = -(-total // workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            travaux = [executor.submit(_solveRange, memoire.name, number, start, finish, a, min(a + taille, total),
+                                       chunkSize)
+                       for a in range(0, total, taille)]
+            for travail in travaux:
+                travail.result()
+        codes = bytes(memoire.buf[:total])
+    finally:
+        memoire.close()
+        memoire.unlink()
+    return PackedMoves(codes, number, start, finish)
+
+
+if __name__ == '__main__':
+    import time
+
+    for n in (16, 20, 24):
+        debut = time.perf_counter()
+        solution = parallelSolve(n)
+        duree = time.perf_counter() - debut
+        print(f"{n} disques:  {len(solution)} coups en {duree:.3f} s")
+    puzzle = solution.replay(ht.HanoiTowers(n))
+    print(f"Solution valide:  {puzzle.valid() and puzzle.tour[1].count() == n}")
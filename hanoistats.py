@@ -0,0 +1,124 @@
+import time
+
+
+class HanoiStats():
+    """Statistiques d'une résolution instrumentée (voir HanoiTowers.instrument).  Le temps de chaque mouvement est
+    découpé en trois:  génération du mouvement, mise à jour des tours (transfer) et consommateur (callback ou code qui
+    parcourt le générateur).
+
+    Attributs:
+    moves(int):  Nombre de mouvements effectués.
+    removes(liste de int):  Nombre de disques enlevés de chaque tour.
+    adds(liste de int):  Nombre de disques ajoutés sur chaque tour.
+    generationTime, transferTime, callbackTime(int):  Temps total, en nanosecondes, de chaque partie.
+    depthMoves(dict):  Nombre de mouvements par profondeur de récurrence.  Le disque d est déplacé à la profondeur
+    number - 1 - d.
+    depthTime(dict):  Temps total, en nanosecondes, des mouvements de chaque profondeur.
+    latency(liste de int):  Histogramme du temps passé dans le consommateur:  latency[b] compte les mouvements dont le
+    temps en nanosecondes s'écrit avec b bits, soit entre 2**(b-1) et 2**b - 1 ns.
+    progress(fonction):  Fonction optionnelle appelée périodiquement avec (mouvements faits, total, secondes
+    restantes estimées).
+    progressInterval(float):  Temps minimal, en secondes, entre deux appels de progress."""
+
+    # Nombre de mouvements entre deux vérifications de l'horloge pour progress.
+    progressCheck = 1024
+
+    def __init__(self, progress=None, progressInterval=1.0):
+        self.progress = progress
+        self.progressInterval = progressInterval
+        self.reset()
+
+    def reset(self):
+        """Remet toutes les statistiques à zéro."""
+        self.moves = 0
+        self.removes = []
+        self.adds = []
+        self.generationTime = 0
+        self.transferTime = 0
+        self.callbackTime = 0
+        self.depthMoves = {}
+        self.depthTime = {}
+        self.latency = [0] * 64
+
+    def track(self, puzzle, mouvements, number, total, consumer=True):
+        """Générateur qui effectue les mouvements sur puzzle, comme HanoiTowers.iterTransfer, en mesurant chaque étape.
+        Args:
+            puzzle(objet HanoiTowers):  Puzzle à modifier.
+            mouvements(itérateur):  Mouvements (départ, arrivée) à effectuer, qui ne modifient pas les tours.
+            number(int):  Nombre de disques transférés.
+            total(int):  Nombre total de mouvements prévus, pour progress.
+            consumer(bool):  Si faux, le code qui parcourt le générateur n'est pas le consommateur (par exemple les
+            lots de HanoiTowers.hanoiTransferBatch, qui mesure lui-même le temps de son callback):  le temps entre deux
+            mouvements n'est compté ni comme temps de callback ni dans l'histogramme de latence."""
+
+        if len(self.removes) < puzzle.count():
+            self.removes.extend([0] * (puzzle.count() - len(self.removes)))
+            self.adds.extend([0] * (puzzle.count() - len(self.adds)))
+        horloge = time.perf_counter_ns
+        debut = dernier = horloge()
+        faits = 0
+
+        t0 = horloge()
+        for (s, f) in mouvements:
+            t1 = horloge()
+            disque = puzzle.tour[s].top()
+            puzzle.transfer(s, f)
+            t2 = horloge()
+            yield s, f
+            t3 = horloge()
+
+            self.moves += 1
+            self.removes[s] += 1
+            self.adds[f] += 1
+            self.generationTime += t1 - t0
+            self.transferTime += t2 - t1
+            if consumer:
+                self.callbackTime += t3 - t2
+                self.latency[min((t3 - t2).bit_length(), 63)] += 1
+            else:
+                t3 = t2
+            if disque is not None:
+                profondeur = number - 1 - disque
+                self.depthMoves[profondeur] = self.depthMoves.get(profondeur, 0) + 1
+                self.depthTime[profondeur] = self.depthTime.get(profondeur, 0) + t3 - t0
+
+            faits += 1
+            if self.progress is not None and faits % HanoiStats.progressCheck == 0 \
+                    and t3 - dernier >= self.progressInterval * 1e9:
+                dernier = t3
+                self.progress(faits, total, (t3 - debut) / 1e9 / faits * (total - faits))
+            t0 = horloge()
+
+        if self.progress is not None:
+            self.progress(faits, total, 0.0)
+
+    def latencyHistogram(self):
+        """Retourne l'histogramme de latence du consommateur sous forme lisible.
+        Returns:
+            (liste de (int, int)):  Couples (borne supérieure en nanosecondes, nombre de mouvements), sans les classes
+            vides."""
+        return [((1 << b) - 1, n) for (b, n) in enumerate(self.latency) if n]
+
+    def summary(self):
+        """Retourne un dictionnaire de toutes les statistiques, par exemple pour l'écrire en JSON."""
+        return {
+            'moves': self.moves,
+            'removes': list(self.removes),
+            'adds': list(self.adds),
+            'generationTime': self.generationTime,
+            'transferTime': self.transferTime,
+            'callbackTime': self.callbackTime,
+            'depthMoves': dict(sorted(self.depthMoves.items())),
+            'depthTime': dict(sorted(self.depthTime.items())),
+            'latency': self.latencyHistogram(),
+        }
+
+    def __str__(self):
+        total = (self.generationTime + self.transferTime + self.callbackTime) or 1
+        texte = [f"{self.moves} coups",
+                 f"génération:  {self.generationTime / 1e6:.1f} ms ({100 * self.generationTime / total:.0f} %)",
+                 f"transfer:  {self.transferTime / 1e6:.1f} ms ({100 * self.transferTime / total:.0f} %)",
+                 f"callback:  {self.callbackTime / 1e6:.1f} ms ({100 * self.callbackTime / total:.0f} %)"]
+        for (i, (r, a)) in enumerate(zip(self.removes, self.adds)):
+            texte.append(f"tour {i}:  {r} retraits, {a} ajouts")
+        return '\n'.join(texte)
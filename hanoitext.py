@@ -0,0 +1,79 @@
+# Écart entre deux colonnes dans la représentation textuelle.
+GAP = " " * 10
+
+
+def columnWidth(towers):
+    """Largeur d'une colonne:  le nombre de chiffres du plus gros numéro de disque."""
+    plusGros = max((t.getDisk()[-1] for t in towers if t.count()), default=0)
+    return len(str(plusGros))
+
+
+def formatRow(towers, row, width, cells=None):
+    """Retourne une ligne de la représentation textuelle.
+    Args:
+        towers(liste d'objets Tower):  Les tours.
+        row(int):  Numéro de la ligne, 0 étant la ligne du bas.
+        width(int):  Largeur d'une colonne.
+        cells(liste de str):  Cellules déjà formatées:  cells[d] pour le disque d, cells[-1] pour une case vide.
+    Returns:
+        (str):  La ligne, une colonne par tour, sans fin de ligne."""
+    if cells is None:
+        return "".join((str(t.diskAt(row)) if row < t.count() else "").rjust(width) + GAP for t in towers)
+    return "".join([cells[t.diskAt(row)] if row < t.count() else cells[-1] for t in towers])
+
+
+def renderTowers(towers):
+    """Représentation en mode texte des tours:  une colonne de chiffres par tour, chaque chiffre identifie un disque, et
+    les tours sont alignées par le bas.  Le texte est construit avec un seul join.
+    Args:
+        towers(liste d'objets Tower):  Les tours.
+    Returns:
+        (str):  Le texte, une ligne par étage."""
+    width = columnWidth(towers)
+    # Une liste par tour, du bas vers le haut:  diskAt n'est pas en temps constant pour toutes les représentations.
+    piles = [t.getDisk()[::-1] for t in towers]
+    hauteur = max((len(p) for p in piles), default=0)
+    return "".join("".join((str(p[row]) if row < len(p) else "").rjust(width) + GAP for p in piles) + "\n"
+                   for row in range(hauteur - 1, -1, -1))
+
+
+class TraceWriter():
+    """Trace d'une résolution:  au lieu de réafficher toutes les tours après chaque mouvement, on écrit seulement les
+    deux lignes qui ont changé (celle d'où le disque est parti et celle où il est arrivé), précédées de leur numéro
+    (0 est la ligne du bas).  La méthode move a la signature du callback de hanoiTransfer:
+
+        trace = TraceWriter(sys.stdout, puzzle)
+        puzzle.hanoiTransfer(20, 0, 1, trace.move)
+
+    Attributs:
+    stream(fichier):  Destination du texte.
+    puzzle(objet HanoiTowers):  Puzzle tracé.
+    width(int):  Largeur d'une colonne, fixée au départ.
+    count(int):  Nombre de mouvements tracés."""
+
+    def __init__(self, stream, puzzle, header=True):
+        self.stream = stream
+        self.puzzle = puzzle
+        self.width = columnWidth(puzzle.tour)
+        self.count = 0
+        disques = sum(t.count() for t in puzzle.tour)
+        self._cells = [str(d).rjust(self.width) + GAP for d in range(disques)] + [" " * self.width + GAP]
+        if header:
+            stream.write(renderTowers(puzzle.tour))
+
+    def move(self, start, finish):
+        """Écrit les lignes modifiées par un mouvement, qui vient d'être effectué sur le puzzle.
+        Args:
+            start(int):  Numéro de la tour de départ.
+            finish(int):  Numéro de la tour d'arrivée."""
+        tours = self.puzzle.tour
+        self.count += 1
+        depart, arrivee = tours[start].count(), tours[finish].count() - 1
+        if depart == arrivee:
+            self.stream.write(f"{self.count}: {start} -> {finish}\n"
+                              f"{depart:>4} | {formatRow(tours, depart, self.width, self._cells)}\n")
+        else:
+            haut, bas = max(depart, arrivee), min(depart, arrivee)
+            self.stream.write(f"{self.count}: {start} -> {finish}\n"
+                              f"{haut:>4} | {formatRow(tours, haut, self.width, self._cells)}\n"
+                              f"{bas:>4} | {formatRow(tours, bas, self.width, self._cells)}\n")
@@ -0,0 +1,332 @@
+import hanoi as ht
+from hanoilog import MoveLog
+
+
+class VerificationResult():
+    """Résultat de verifyMoves.
+
+    Attributs:
+    legal(bool):  True si tous les mouvements sont légaux.
+    firstViolation(int):  Numéro du premier mouvement illégal, ou None.
+    reason(str):  Explication de la première violation, ou None.
+    moves(int):  Nombre de mouvements vérifiés (jusqu'à la première violation exclue).
+    final(liste de int):  Configuration atteinte (tour de chaque disque), après les mouvements vérifiés.
+    reachedTarget(bool):  True si la configuration cible est atteinte (toujours True sans cible).
+    optimal(bool):  True si la suite est légale, atteint la cible et a le nombre minimal de mouvements."""
+
+    def __init__(self, legal, firstViolation, reason, moves, final, reachedTarget, optimal):
+        self.legal = legal
+        self.firstViolation = firstViolation
+        self.reason = reason
+        self.moves = moves
+        self.final = final
+        self.reachedTarget = reachedTarget
+        self.optimal = optimal
+
+    def __bool__(self):
+        return self.legal and self.reachedTarget
+
+    def __repr__(self):
+        if not self.legal:
+            return f"VerificationResult(illégal au mouvement {self.firstViolation}:  {self.reason})"
+        return f"VerificationResult(légal, {self.moves} coups, cible atteinte={self.reachedTarget}, " \
+               f"optimal={self.optimal})"
+
+
+# Tours de départ et d'arrivée, et variation de la hauteur de chaque tour, pour chaque code de mouvement.
+SOURCES = (0, 0, 1, 1, 2, 2)
+DESTINATIONS = (1, 2, 0, 2, 0, 1)
+HEIGHTS = ((-1, 1, 0), (-1, 0, 1), (1, -1, 0), (0, -1, 1), (1, 0, -1), (0, 1, -1))
+
+# Nombre de mouvements vérifiés à la fois par _checkBlock:  assez peu pour que les tableaux restent dans le cache.
+BLOCK = 1 << 14
+
+
+def _clampCodes(codes):
+    """Convertit un tableau NumPy d'entiers en codes uint8, en remplaçant tout code hors de 0..5 par 6 (invalide)."""
+    np = ht.np
+    codes = np.asarray(codes)
+    if codes.dtype == np.uint8:
+        return np.minimum(codes, 6)
+    return np.where((codes < 0) | (codes > 5), 6, codes).astype(np.uint8)
+
+
+def _pairsToCodes(paires):
+    """Convertit des couples (départ, arrivée) en tableau NumPy de codes (voir HanoiTowers.moveCode).  Les mouvements
+    invalides reçoivent le code 6."""
+    np = ht.np
+    paires = np.asarray(paires, dtype=np.int64).reshape(-1, 2)
+    s, f = paires[:, 0], paires[:, 1]
+    codes = 2 * s + f - (f > s)
+    codes[(s < 0) | (s > 2) | (f < 0) | (f > 2) | (s == f)] = 6
+    return codes.astype(np.uint8)
+
+
+def _codeSource(moves):
+    """Accès par tranches aux codes d'une suite de mouvements, pour ne jamais décoder toute la suite d'un coup.
+    Returns:
+        (int, fonction):  Le nombre de mouvements et une fonction (a, b) -> tableau NumPy des codes des mouvements a
+        à b, ou None si NumPy est absent ou si la suite ne peut être lue que mouvement par mouvement."""
+    np = ht.np
+    if np is None:
+        return None
+    if isinstance(moves, MoveLog):
+        return len(moves), moves.codes
+    if isinstance(moves, np.ndarray) and moves.ndim == 1:
+        return len(moves), lambda a, b: _clampCodes(moves[a:b])
+    if isinstance(moves, (bytes, bytearray)) or getattr(moves, 'typecode', None) == 'B':
+        codes = np.frombuffer(moves, dtype=np.uint8)
+        return len(codes), lambda a, b: _clampCodes(codes[a:b])
+    if isinstance(moves, memoryview) or hasattr(moves, 'typecode'):
+        codes = np.array(moves, dtype=np.int64)
+        return len(codes), lambda a, b: _clampCodes(codes[a:b])
+    if isinstance(moves, np.ndarray) and moves.ndim == 2:
+        return len(moves), lambda a, b: _pairsToCodes(moves[a:b])
+    if isinstance(moves, (list, tuple)):
+        return len(moves), lambda a, b: _pairsToCodes(moves[a:b])
+    return None
+
+
+def _pairs(moves):
+    """Itérateur des couples (départ, arrivée) d'une suite de mouvements quelconque.  Un code invalide donne None."""
+    if isinstance(moves, MoveLog):
+        return iter(moves)
+    if isinstance(moves, (bytes, bytearray, memoryview)) or hasattr(moves, 'typecode'):
+        return (ht.PEGPAIRS[c] if 0 <= c < 6 else None for c in moves)
+    return iter(moves)
+
+
+def _optimalPrefix(length, codesAt, number, start, finish, chunkSize):
+    """Longueur du plus long début de la suite qui suit la solution optimale de start vers finish, comparé par blocs
+    avec HanoiTowers.codeRange.  Les codes sont décodés bloc par bloc avec codesAt(a, b)."""
+    puzzle = ht.HanoiTowers(0)
+    fin = min(length, (1 << number) - 1)
+    for debut in range(0, fin, chunkSize):
+        bloc = min(debut + chunkSize, fin)
+        ecarts = ht.np.flatnonzero(codesAt(debut, bloc) != puzzle.codeRange(debut, bloc, number, start, finish))
+        if len(ecarts):
+            return debut + int(ecarts[0])
+    return fin
+
+
+def _checkBlock(codes, stacks):
+    """Vérifie un bloc de mouvements sans boucle Python, à partir des piles de disques de chaque tour.
+
+    Chaque mouvement est vu comme deux événements:  un retrait sur la tour de départ et un ajout sur la tour
+    d'arrivée.  Une somme cumulative donne la hauteur de chaque tour après chaque mouvement, donc le niveau (1 pour le
+    bas) de chaque événement.  Sur une tour, les ajouts et les retraits se répondent comme des parenthèses:  une fois
+    les événements triés par (tour, niveau, temps), chaque retrait suit immédiatement l'ajout du disque qu'il enlève.
+    Le disque déplacé par chaque mouvement se retrouve alors en remontant ces liens jusqu'à la pile initiale (par
+    sauts de pointeurs, en log2(len(codes)) passes).  Pour le disque de dessous, un événement « requête » est placé
+    juste avant chaque ajout, au niveau inférieur:  le dernier ajout qui le précède dans le tri est ce disque.
+
+    Args:
+        codes (tableau NumPy):  Codes des mouvements (voir HanoiTowers.moveCode).
+        stacks (liste de listes de int):  Disques de chaque tour, du bas vers le haut.  Remplacées par l'état atteint
+        après le dernier mouvement légal.
+    Returns:
+        (int, int, str):  Nombre de mouvements légaux, indice dans le bloc du premier mouvement illégal (ou None) et
+        raison."""
+    np = ht.np
+    m = len(codes)
+    if m == 0:
+        return 0, None, None
+
+    # Un mouvement illégal:  on vérifie d'abord ce qui le précède, qui peut contenir une autre violation.
+    invalides = np.flatnonzero(codes >= 6)
+    if len(invalides):
+        v = int(invalides[0])
+        compte, violation, raison = _checkBlock(codes[:v], stacks)
+        if violation is not None:
+            return compte, violation, raison
+        return v, v, "mouvement invalide (code hors de 0 à 5)"
+    codes = codes.astype(np.intp)
+
+    # Hauteur de chaque tour après chaque mouvement, et niveau des retraits (avant) et des ajouts (après).
+    hauteurs = np.take(np.array(HEIGHTS, dtype=np.intp), codes, axis=0)
+    hauteurs[0] += [len(pile) for pile in stacks]
+    np.cumsum(hauteurs, axis=0, out=hauteurs)
+    s = np.take(np.array(SOURCES, dtype=np.intp), codes)
+    f = np.take(np.array(DESTINATIONS, dtype=np.intp), codes)
+    plat = hauteurs.ravel()
+    lignes = np.arange(0, 3 * m, 3)
+    niveauRetrait = plat[lignes + s] + 1
+    niveauAjout = plat[lignes + f]
+    vides = np.flatnonzero(niveauRetrait == 0)
+    if len(vides):
+        v = int(vides[0])
+        compte, violation, raison = _checkBlock(codes[:v], stacks)
+        if violation is not None:
+            return compte, violation, raison
+        return v, v, f"la tour {int(s[v])} est vide"
+
+    # Événements dans l'ordre du temps:  la pile initiale (K ajouts), puis retrait, requête et ajout de chaque
+    # mouvement.  La clé (tour, niveau) est triée de façon stable, donc par temps à clé égale.
+    initiaux = np.array([d for pile in stacks for d in pile], dtype=np.intp)
+    K = len(initiaux)
+    largeur = K + 2
+    E = K + 3 * m
+    cles = np.empty(E, dtype=np.int16 if 3 * largeur < 1 << 15 else np.int32)
+    cles[:K] = [p * largeur + niveau for (p, pile) in enumerate(stacks) for niveau in range(1, len(pile) + 1)]
+    cles[K::3] = s * largeur + niveauRetrait
+    cles[K + 1::3] = f * largeur + niveauAjout - 1
+    cles[K + 2::3] = f * largeur + niveauAjout
+    ordre = np.argsort(cles, kind='stable')
+
+    # precedent[e]:  dernier événement réel (pas une requête) qui précède e dans le tri.
+    reels = np.ones(E, dtype=bool)
+    reels[K + 1::3] = False
+    dernier = np.where(reels[ordre], np.arange(E), 0)
+    np.maximum.accumulate(dernier, out=dernier)
+    precedent = np.zeros(E, dtype=np.intp)
+    precedent[ordre[1:]] = ordre[dernier[:-1]]
+
+    # Disque déplacé:  chaque mouvement pointe vers le mouvement qui a ajouté le disque qu'il retire (K + numéro), ou
+    # vers un disque de la pile initiale (indice < K).
+    apparie = precedent[K::3]
+    pointeurs = np.concatenate((np.arange(K), np.where(apparie < K, apparie, K + (apparie - K) // 3)))
+    while True:
+        suivants = pointeurs[pointeurs]
+        if np.array_equal(suivants, pointeurs):
+            break
+        pointeurs = suivants
+    disques = np.full(E, -1, dtype=np.intp)
+    disques[:K] = initiaux
+    disques[K::3] = disques[K + 2::3] = initiaux[pointeurs[K:]]
+    deplace = disques[K + 2::3]
+    dessous = disques[precedent[K + 1::3]]
+    mauvais = np.flatnonzero((niveauAjout >= 2) & (deplace > dessous))
+    if len(mauvais):
+        v = int(mauvais[0])
+        _checkBlock(codes[:v], stacks)
+        return v, v, f"le disque {int(deplace[v])} irait sur le disque {int(dessous[v])}"
+
+    # Piles atteintes:  le dernier événement réel de chaque (tour, niveau) occupé.
+    triees = cles[ordre]
+    for p in range(3):
+        bornes = np.searchsorted(triees, p * largeur + np.arange(2, int(hauteurs[-1, p]) + 2)) - 1
+        stacks[p] = disques[ordre[dernier[bornes]]].tolist()
+    return m, None, None
+
+
+def _replay(pairs, stacks, first):
+    """Vérification mouvement par mouvement, avec une pile de disques par tour, lorsque NumPy n'est pas disponible.
+    Returns:
+        (int, int, str):  Nombre de mouvements valides, numéro du premier mouvement illégal (ou None) et raison."""
+    k = first
+    for paire in pairs:
+        if paire is None or len(paire) != 2 or not all(p in (0, 1, 2) for p in paire) or paire[0] == paire[1]:
+            return k, k, f"mouvement invalide {paire}"
+        s, f = paire
+        source, destination = stacks[s], stacks[f]
+        if not source:
+            return k, k, f"la tour {s} est vide"
+        if destination and destination[-1] < source[-1]:
+            return k, k, f"le disque {source[-1]} irait sur le disque {destination[-1]}"
+        destination.append(source.pop())
+        k += 1
+    return k, None, None
+
+
+def verifyMoves(moves, initial=None, target=None, chunkSize=1 << 16):
+    """Vérifie une suite de mouvements (3 tours):  légalité de chaque mouvement et optimalité de la suite.
+
+    Si la configuration de départ a tous ses disques sur une même tour, le début de la suite est d'abord comparé, par
+    blocs vectorisés (NumPy), à la solution optimale calculée directement à partir des numéros de mouvement.  À partir
+    du premier écart (ou dès le début pour une autre configuration), la légalité est vérifiée par blocs, elle aussi
+    sans boucle Python (voir _checkBlock), depuis l'état calculé avec HanoiTowers.stateAt.  Les codes d'un fichier de
+    mouvements sont décodés bloc par bloc:  la mémoire utilisée ne dépend pas de la longueur de la suite.
+
+    Args:
+        moves:  Les mouvements:  liste de couples (départ, arrivée), codes (bytes, array('B'), tableau NumPy), objet
+        hanoilog.MoveLog ou chemin d'un fichier écrit par hanoilog.MoveLogWriter.
+        initial (liste de int ou int):  Configuration de départ (tour de chaque disque), ou un nombre de disques tous
+        sur la tour 0.  Par défaut, celle donnée par l'en-tête d'un MoveLog.
+        target (liste de int ou int):  Configuration à atteindre, ou le numéro d'une tour qui doit recevoir tous les
+        disques.  Par défaut, celle de l'en-tête d'un MoveLog, sinon aucune cible.
+        chunkSize (int):  Nombre de mouvements décodés et comparés à la fois.
+    Returns:
+        (objet VerificationResult):  Le résultat."""
+
+    fermer = False
+    if isinstance(moves, str):
+        moves = MoveLog(moves)
+        fermer = True
+    try:
+        if isinstance(moves, MoveLog):
+            if moves.towers != 3:
+                raise ValueError("La vérification n'est possible qu'avec 3 tours.")
+            if initial is None:
+                initial = [moves.start] * moves.number
+            if target is None:
+                target = moves.finish
+        if initial is None:
+            raise ValueError("Il faut donner la configuration de départ.")
+        if isinstance(initial, int):
+            initial = [0] * initial
+        number = len(initial)
+        if isinstance(target, int):
+            target = [target] * number
+
+        pegs = list(initial)
+        premier = 0
+        source = _codeSource(moves)
+        if source is not None and number and source[0] and len(set(initial)) == 1:
+            longueur, codesAt = source
+            start = initial[0]
+            arrivees = [target[0]] if target is not None and len(set(target)) == 1 and target[0] != start \
+                else [f for f in range(3) if f != start]
+            # Choisir la tour d'arrivée dont la solution commence comme la suite à vérifier.
+            puzzle = ht.HanoiTowers(0)
+            code = int(codesAt(0, 1)[0])
+            finish = next((f for f in arrivees
+                           if code == ht.HanoiTowers.moveCode(*puzzle.moveAt(0, number, start, f))), None)
+            if finish is not None:
+                premier = _optimalPrefix(longueur, codesAt, number, start, finish, chunkSize)
+                pegs = puzzle.stateAt(premier, number, start, finish)
+
+        stacks = [[], [], []]
+        for d in range(number - 1, -1, -1):
+            stacks[pegs[d]].append(d)
+        if source is not None:
+            longueur, codesAt = source
+            compte, violation, raison = premier, None, None
+            for debut in range(premier, longueur, chunkSize):
+                codes = codesAt(debut, min(debut + chunkSize, longueur))
+                for bloc in range(0, len(codes), BLOCK):
+                    valides, violation, raison = _checkBlock(codes[bloc:bloc + BLOCK], stacks)
+                    compte += valides
+                    if violation is not None:
+                        violation = compte
+                        break
+                if violation is not None:
+                    break
+        else:
+            compte, violation, raison = _replay(_pairs(moves), stacks, premier)
+    finally:
+        if fermer:
+            moves.close()
+
+    final = [0] * number
+    for (p, pile) in enumerate(stacks):
+        for d in pile:
+            final[d] = p
+    legal = violation is None
+    atteinte = target is None or final == list(target)
+    optimal = legal and atteinte and compte == ht.HanoiTowers.configurationDistance(list(initial), final)
+    return VerificationResult(legal, violation, raison, compte, final, atteinte, optimal)
+
+
+if __name__ == '__main__':
+    import time
+
+    n = 24
+    solution = ht.HanoiTowers(0).codeRange(0, (1 << n) - 1, n, 0, 1)
+    debut = time.perf_counter()
+    resultat = verifyMoves(solution, n, 1)
+    duree = time.perf_counter() - debut
+    print(f"{resultat}:  {len(solution) / duree / 1e6:.0f} millions de coups par seconde")
+
+    s, f = ht.HanoiTowers(0).moveAt(1000, n, 0, 1)
+    solution[1000] = ht.HanoiTowers.moveCode(f, s)
+    print(verifyMoves(solution, n, 1))
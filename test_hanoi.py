@@ -0,0 +1,267 @@
+import contextlib
+import itertools
+import unittest
+from collections import deque
+
+import hanoi as ht
+
+
+def _boards(number):
+    """Toutes les configurations de number disques sur 3 tours."""
+    return [list(p) for p in itertools.product(range(3), repeat=number)]
+
+
+def _distances(source):
+    """Distances minimales de source à toutes les configurations, par parcours en largeur."""
+    distances = {tuple(source): 0}
+    file = deque([tuple(source)])
+    while file:
+        pegs = file.popleft()
+        for (s, f) in ht.PEGPAIRS:
+            dessus = [d for d in range(len(pegs)) if pegs[d] == s]
+            if not dessus or any(pegs[d] == f for d in range(dessus[0])):
+                continue
+            suivante = pegs[:dessus[0]] + (f,) + pegs[dessus[0] + 1:]
+            if suivante not in distances:
+                distances[suivante] = distances[pegs] + 1
+                file.append(suivante)
+    return distances
+
+
+def _play(source, moves):
+    """Effectue les mouvements à partir de source, en refusant tout mouvement illégal, et retourne la configuration."""
+    puzzle = ht.HanoiTowers(len(source), check='raise')
+    puzzle.setConfiguration(source)
+    for (s, f) in moves:
+        puzzle.transfer(s, f)
+    return puzzle.configuration()
+
+
+class ClosedFormTest(unittest.TestCase):
+    """moveAt, stateAt et seek comparés à la solution récursive."""
+
+    def test_moveAt_stateAt(self):
+        puzzle = ht.HanoiTowers(0)
+        for number in range(1, 8):
+            for (start, finish) in ht.PEGPAIRS:
+                rejoue = ht.HanoiTowers(number, check='raise')
+                rejoue.setConfiguration([start] * number)
+                for (k, move) in enumerate(ht.HanoiTowers.moves(number, start, finish)):
+                    self.assertEqual(puzzle.stateAt(k, number, start, finish), rejoue.configuration())
+                    self.assertEqual(puzzle.moveAt(k, number, start, finish), move)
+                    rejoue.transfer(*move)
+                self.assertEqual(puzzle.stateAt((1 << number) - 1, number, start, finish), [finish] * number)
+
+    def test_seek_movesFrom(self):
+        moves = list(ht.HanoiTowers.moves(6, 2, 1))
+        for k in (0, 1, 17, 40, len(moves)):
+            puzzle = ht.HanoiTowers(8)
+            puzzle.seek(k, 6, 2, 1)
+            self.assertEqual(puzzle.configuration(), puzzle.stateAt(k, 6, 2, 1) + [0, 0])
+            self.assertEqual(list(puzzle.movesFrom(k, 6, 2, 1)), moves[k:])
+
+    def test_seek_refuses_missing_disks(self):
+        with self.assertRaises(ValueError):
+            ht.HanoiTowers(5).seek(3, 7)
+        with self.assertRaises(ValueError):
+            ht.HanoiTowers(5).hanoiTransferBatch(7, 0, 1, lambda lot: None)
+
+    @unittest.skipIf(ht.np is None, "NumPy n'est pas installé")
+    def test_ranges(self):
+        puzzle = ht.HanoiTowers(0)
+        number = 9
+        for (start, finish) in ht.PEGPAIRS:
+            moves = list(ht.HanoiTowers.moves(number, start, finish))
+            for (a, b) in ((0, len(moves)), (0, 1), (100, 333), (len(moves) - 5, len(moves))):
+                src, dst, disk = puzzle.moveRange(a, b, number, start, finish)
+                self.assertEqual(list(zip(src.tolist(), dst.tolist())), moves[a:b])
+                codes = puzzle.codeRange(a, b, number, start, finish)
+                self.assertEqual(codes.tolist(), [ht.HanoiTowers.moveCode(*m) for m in moves[a:b]])
+        self.assertEqual(puzzle.codeRange(5, 8, 64).tolist(),
+                         [ht.HanoiTowers.moveCode(*puzzle.moveAt(k, 64)) for k in (5, 6, 7)])
+        with self.assertRaises(ValueError):
+            puzzle.moveRange((1 << 64) - 5, (1 << 64) - 1, 64)
+        with self.assertRaises(ValueError):
+            puzzle.moveRange(0, (1 << 63) - 1, 63)
+
+
+class FrameStewartTest(unittest.TestCase):
+    """Résolution avec plus de trois tours:  nombres de mouvements connus et légalité de chaque mouvement."""
+
+    def test_move_counts(self):
+        attendus = {3: [1, 3, 7, 15, 31, 63, 127, 255],
+                    4: [1, 3, 5, 9, 13, 17, 25, 33],
+                    5: [1, 3, 5, 7, 11, 15, 19, 23]}
+        for (towers, counts) in attendus.items():
+            for (number, count) in enumerate(counts, 1):
+                self.assertEqual(ht.HanoiTowers(number, towers=towers).minimumMoves(), count)
+                self.assertEqual(len(list(ht.HanoiTowers.frameStewartMoves(number, 0, 1, towers))), count)
+
+    def test_legal_moves(self):
+        for towers in (4, 5, 6):
+            for (start, finish) in ((0, towers - 1), (towers - 1, 1), (2, 0)):
+                puzzle = ht.HanoiTowers(9, towers=towers, check='raise')
+                if start != 0:
+                    puzzle.setConfiguration([start] * 9)
+                puzzle.hanoiTransfer(9, start, finish, lambda s, f: None)
+                self.assertEqual(puzzle.configuration(), [finish] * 9)
+
+
+class ConfigurationTest(unittest.TestCase):
+    """Résolution d'une configuration quelconque comparée à un parcours en largeur."""
+
+    def test_optimal_moves(self):
+        for number in range(1, 5):
+            boards = _boards(number)
+            for source in boards:
+                distances = _distances(source)
+                for target in boards:
+                    moves = list(ht.HanoiTowers.configurationMoves(source, target))
+                    self.assertEqual(len(moves), distances[tuple(target)], (source, target))
+                    self.assertEqual(ht.HanoiTowers.configurationDistance(source, target), len(moves))
+                    self.assertEqual(_play(source, moves), target)
+
+    def test_distance_five_disks(self):
+        boards = _boards(5)
+        for source in boards[::7]:
+            distances = _distances(source)
+            for target in boards:
+                self.assertEqual(ht.HanoiTowers.configurationDistance(source, target), distances[tuple(target)])
+
+
+class BatchTest(unittest.TestCase):
+    """Transfert par lots comparé à la solution récursive."""
+
+    def test_batches(self):
+        moves = list(ht.HanoiTowers.moves(10, 0, 2))
+        for (format, batchSize) in (('tuples', 100), ('array', 7), ('memoryview', 1 << 12)):
+            puzzle = ht.HanoiTowers(10)
+            lots = []
+            total = puzzle.hanoiTransferBatch(10, 0, 2, lambda lot: lots.append(lot), batchSize, format)
+            self.assertEqual(total, len(moves))
+            self.assertTrue(all(len(lot) <= batchSize for lot in lots))
+            if format == 'tuples':
+                self.assertEqual([m for lot in lots for m in lot], moves)
+            else:
+                self.assertEqual([c for lot in lots for c in lot], [ht.HanoiTowers.moveCode(*m) for m in moves])
+            self.assertEqual(puzzle.configuration(), [2] * 10)
+
+    def test_early_stop(self):
+        puzzle = ht.HanoiTowers(8)
+        total = puzzle.hanoiTransferBatch(8, 0, 1, lambda lot: False, 10)
+        self.assertEqual(total, 10)
+        self.assertEqual(puzzle.configuration(), puzzle.stateAt(10, 8, 0, 1))
+
+    def test_disks_not_on_start(self):
+        puzzle = ht.HanoiTowers(5, check='count')
+        puzzle.transfer(0, 2)
+        self.assertEqual(puzzle.hanoiTransferBatch(3, 0, 1, lambda lot: None), 7)
+        self.assertEqual(puzzle.violations, 4)
+        with self.assertRaises(ht.IllegalMoveError):
+            puzzle = ht.HanoiTowers(5, check='raise')
+            puzzle.transfer(0, 2)
+            puzzle.hanoiTransferBatch(3, 0, 1, lambda lot: None)
+
+    def test_instrumented_batches(self):
+        puzzle = ht.HanoiTowers(9)
+        stats = puzzle.instrument()
+        lots = []
+        self.assertEqual(puzzle.hanoiTransferBatch(9, 0, 2, lots.extend, 100), 511)
+        self.assertEqual(lots, list(ht.HanoiTowers.moves(9, 0, 2)))
+        self.assertEqual(stats.moves, 511)
+        self.assertEqual(sum(stats.latency), 0)
+        self.assertGreater(stats.callbackTime, 0)
+        self.assertEqual(puzzle.configuration(), [2] * 9)
+
+    def test_many_towers(self):
+        puzzle = ht.HanoiTowers(4, towers=18)
+        lots = []
+        total = puzzle.hanoiTransferBatch(4, 0, 17, lots.append, format='array')
+        self.assertEqual(total, len(list(ht.HanoiTowers.frameStewartMoves(4, 0, 17, 18))))
+        self.assertEqual(lots[0].typecode, 'H')
+        self.assertEqual(puzzle.configuration(), [17] * 4)
+
+
+class CheckTest(unittest.TestCase):
+    """Contrôle des mouvements dans transfer selon le mode check."""
+
+    def _illegal(self, puzzle):
+        """Tente un mouvement à partir d'une tour vide, puis le disque 1 sur le disque 0."""
+        puzzle.transfer(1, 2)
+        puzzle.transfer(0, 1)
+        puzzle.transfer(0, 1)
+
+    def test_without_check(self):
+        puzzle = ht.HanoiTowers(3)
+        self._illegal(puzzle)
+        self.assertEqual(puzzle.configuration(), [1, 1, 0])
+        self.assertFalse(puzzle.valid())
+        self.assertEqual(puzzle.violations, 0)
+
+    def test_count_and_log(self):
+        for check in ('count', 'log'):
+            puzzle = ht.HanoiTowers(3, check=check)
+            with self.assertLogs('hanoi', 'WARNING') if check == 'log' else contextlib.nullcontext() as journal:
+                self._illegal(puzzle)
+            self.assertEqual(puzzle.configuration(), [1, 0, 0])
+            self.assertTrue(puzzle.valid())
+            self.assertEqual(puzzle.violations, 2)
+            if check == 'log':
+                self.assertEqual(len(journal.records), 2)
+
+    def test_raise(self):
+        puzzle = ht.HanoiTowers(3, check='raise')
+        with self.assertRaises(ht.IllegalMoveError):
+            puzzle.transfer(1, 2)
+        puzzle.transfer(0, 1)
+        with self.assertRaises(ValueError):
+            puzzle.transfer(0, 1)
+        self.assertEqual(puzzle.configuration(), [1, 0, 0])
+        self.assertEqual(puzzle.violations, 2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            ht.HanoiTowers(3, check='strict')
+
+
+class BitsBackendTest(unittest.TestCase):
+    """Tours représentées par des masques de bits, comparées aux tours par défaut."""
+
+    def test_solve(self):
+        for towers in (3, 4):
+            tableau = ht.HanoiTowers(10, towers=towers)
+            bits = ht.HanoiTowers(10, towers=towers, backend='bits')
+            for (s, f) in tableau.hanoiTransfer(10, 0, 2):
+                bits.transfer(s, f)
+                self.assertEqual(bits.snapshot(), tableau.snapshot())
+            self.assertEqual(bits.configuration(), [2] * 10)
+            self.assertEqual(str(bits), str(tableau))
+            self.assertEqual(bits.violations, 0)
+
+    def test_snapshot_restore(self):
+        puzzle = ht.HanoiTowers(7, backend='bits')
+        etats = {}
+        for (k, _) in enumerate(puzzle.hanoiTransfer(7, 0, 1)):
+            etats[puzzle.snapshot()] = k
+        self.assertEqual(len(etats), 127)
+        copie = puzzle.snapshot()
+        puzzle.seek(40, 7, 0, 1)
+        self.assertEqual(etats[puzzle.snapshot()], 39)
+        puzzle.restore(copie)
+        self.assertEqual(puzzle.configuration(), [1] * 7)
+        with self.assertRaises(ValueError):
+            puzzle.restore(copie[:2])
+
+    def test_forced_check(self):
+        puzzle = ht.HanoiTowers(3, backend='bits')
+        self.assertEqual(puzzle.check, 'count')
+        puzzle.transfer(0, 1)
+        puzzle.transfer(0, 1)
+        puzzle.transfer(2, 0)
+        self.assertEqual(puzzle.configuration(), [1, 0, 0])
+        self.assertEqual(puzzle.violations, 2)
+        self.assertEqual(ht.HanoiTowers(3, check='raise', backend='bits').check, 'raise')
+
+
+if __name__ == '__main__':
+    unittest.main()
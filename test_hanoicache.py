@@ -0,0 +1,50 @@
+import unittest
+
+import hanoi as ht
+import hanoicache
+
+
+class SolutionCacheTest(unittest.TestCase):
+    """Suites du cache comparées à la solution récursive, éviction et statistiques."""
+
+    def test_all_peg_pairs(self):
+        cache = hanoicache.SolutionCache()
+        for number in range(0, 9):
+            for (start, finish) in ht.PEGPAIRS:
+                moves = list(ht.HanoiTowers.moves(number, start, finish))
+                vue = cache.get(number, start, finish)
+                self.assertEqual(len(vue), len(moves))
+                self.assertEqual(list(vue), moves)
+                self.assertEqual(vue.tobytes(), bytes(ht.HanoiTowers.moveCode(*m) for m in moves))
+                if moves:
+                    self.assertEqual(vue[len(moves) // 2], moves[len(moves) // 2])
+                    self.assertEqual(list(vue[3:40:2]), moves[3:40:2])
+
+    def test_invalid_towers(self):
+        cache = hanoicache.SolutionCache()
+        for (start, finish) in ((0, 0), (0, 3), (-1, 1)):
+            with self.assertRaises(ValueError):
+                cache.get(4, start, finish)
+
+    def test_lru_eviction(self):
+        cache = hanoicache.SolutionCache(maxBytes=50)
+        cache.canonical(4)  # Conserve 3 et 4 disques:  7 + 15 octets.
+        cache.canonical(2)  # Conserve 1 et 2 disques:  1 + 3 octets.
+        cache.canonical(3)
+        # 5 disques (31 octets) se construit à partir de 4:  1, 2 puis 3 sont les moins récemment utilisées.
+        cache.canonical(5)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 3, 'evictions': 3, 'entries': 2, 'bytes': 46,
+                                         'maxBytes': 50})
+        cache.canonical(4)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        cache.canonical(3)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_sequence_larger_than_cache(self):
+        cache = hanoicache.SolutionCache(maxBytes=10)
+        self.assertEqual(list(cache.get(5, 2, 0)), list(ht.HanoiTowers.moves(5, 2, 0)))
+        self.assertEqual((cache.stats()['entries'], cache.stats()['bytes']), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+import hanoi as ht
+import hanoilog
+
+
+class MoveLogTest(unittest.TestCase):
+    """Écriture puis relecture des fichiers de mouvements."""
+
+    def setUp(self):
+        descripteur, self.path = tempfile.mkstemp(suffix='.hnoi')
+        os.close(descripteur)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        for (towers, number, start, finish) in ((3, 11, 0, 2), (4, 9, 1, 3), (5, 8, 2, 0)):
+            if towers == 3:
+                moves = list(ht.HanoiTowers.moves(number, start, finish))
+            else:
+                moves = list(ht.HanoiTowers.frameStewartMoves(number, start, finish, towers))
+            with hanoilog.MoveLogWriter(self.path, number, towers, start, finish) as writer:
+                for move in moves:
+                    writer.write(*move)
+            with hanoilog.MoveLog(self.path) as log:
+                self.assertEqual((log.number, log.towers, log.start, log.finish), (number, towers, start, finish))
+                self.assertEqual(len(log), len(moves))
+                self.assertEqual(list(log), moves)
+                self.assertEqual([log[k] for k in range(len(moves))], moves)
+                self.assertEqual(list(log[7:200:3]), moves[7:200:3])
+                self.assertEqual(list(log[-5:]), moves[-5:])
+                if ht.np is not None:
+                    fin = min(50, len(moves))
+                    self.assertEqual(log.codes(3, fin).tolist(), [log.code(k) for k in range(3, fin)])
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"pas un fichier de mouvements" * 4)
+        with self.assertRaises(ValueError):
+            hanoilog.MoveLog(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import io
+import unittest
+
+import hanoi as ht
+import hanoitext
+
+
+def _rows(texte):
+    """Lignes d'une représentation textuelle, indexées à partir du bas."""
+    lignes = texte.splitlines()
+    return {len(lignes) - 1 - i: ligne for (i, ligne) in enumerate(lignes)}
+
+
+class RenderTest(unittest.TestCase):
+    """Représentation textuelle des tours."""
+
+    def test_render(self):
+        puzzle = ht.HanoiTowers(3)
+        vide = " " + hanoitext.GAP
+        self.assertEqual(str(puzzle), "".join(f"{d}{hanoitext.GAP}{vide}{vide}\n" for d in range(3)))
+        puzzle = ht.HanoiTowers(11)
+        puzzle.setConfiguration([2, 0, 1] + [0] * 8)
+        lignes = str(puzzle).splitlines()
+        self.assertEqual(len(lignes), 9)
+        self.assertEqual(lignes[-1].split(), ['10', '2', '0'])
+        self.assertEqual(lignes[0].split(), ['1'])
+        self.assertTrue(all(len(ligne) == 3 * (2 + len(hanoitext.GAP)) for ligne in lignes))
+
+    def test_empty(self):
+        self.assertEqual(str(ht.HanoiTowers(0)), "")
+
+
+class TraceWriterTest(unittest.TestCase):
+    """Les lignes écrites par TraceWriter, appliquées à la représentation de départ, redonnent celle des tours après
+    chaque mouvement."""
+
+    def test_trace(self):
+        for (towers, number) in ((3, 6), (4, 11)):
+            puzzle = ht.HanoiTowers(number, towers=towers)
+            flux = io.StringIO()
+            trace = hanoitext.TraceWriter(flux, puzzle)
+            lignes = _rows(flux.getvalue())
+            vide = " " * len(lignes[0])
+            attendu = []
+
+            def move(s, f):
+                flux.seek(0)
+                flux.truncate()
+                trace.move(s, f)
+                texte = flux.getvalue().splitlines()
+                attendu.append(f"{trace.count}: {s} -> {f}")
+                self.assertEqual(texte[0], attendu[-1])
+                self.assertIn(len(texte), (2, 3))
+                for ligne in texte[1:]:
+                    row, contenu = ligne.split(" | ", 1)
+                    lignes[int(row)] = contenu
+                rendu = _rows(str(puzzle))
+                for (row, contenu) in lignes.items():
+                    self.assertEqual(contenu, rendu.get(row, vide))
+
+            puzzle.hanoiTransfer(number, 0, 2, move)
+            self.assertEqual(trace.count, puzzle.minimumMoves())
+
+    def test_no_header(self):
+        flux = io.StringIO()
+        hanoitext.TraceWriter(flux, ht.HanoiTowers(4), header=False)
+        self.assertEqual(flux.getvalue(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
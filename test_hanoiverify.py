@@ -0,0 +1,118 @@
+import os
+import random
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+
+import hanoi as ht
+import hanoilog
+import hanoiverify as hv
+
+
+def _randomWalk(initial, length, seed):
+    """Suite aléatoire de mouvements légaux à partir de initial."""
+    hasard = random.Random(seed)
+    piles = [[d for d in range(len(initial) - 1, -1, -1) if initial[d] == p] for p in range(3)]
+    moves = []
+    for _ in range(length):
+        possibles = [(s, f) for (s, f) in ht.PEGPAIRS if piles[s] and (not piles[f] or piles[f][-1] > piles[s][-1])]
+        s, f = hasard.choice(possibles)
+        piles[f].append(piles[s].pop())
+        moves.append((s, f))
+    return moves
+
+
+def _firstViolation(initial, moves):
+    """Vérification naïve:  numéro du premier mouvement refusé par transfer en mode 'raise', ou None."""
+    puzzle = ht.HanoiTowers(len(initial), check='raise')
+    puzzle.setConfiguration(initial)
+    for (k, (s, f)) in enumerate(moves):
+        if not (0 <= s < 3 and 0 <= f < 3) or s == f:
+            return k
+        try:
+            puzzle.transfer(s, f)
+        except ht.IllegalMoveError:
+            return k
+    return None
+
+
+def _codes(moves):
+    return array('B', [ht.HanoiTowers.moveCode(*m) for m in moves])
+
+
+class VerifyTest(unittest.TestCase):
+
+    def test_optimal_solution(self):
+        moves = list(ht.HanoiTowers.moves(10, 0, 2))
+        for entree in (moves, _codes(moves), bytes(_codes(moves)), array('H', _codes(moves))):
+            resultat = hv.verifyMoves(entree, 10, 2)
+            self.assertTrue(resultat.legal and resultat.reachedTarget and resultat.optimal)
+            self.assertEqual(resultat.moves, len(moves))
+            self.assertEqual(resultat.final, [2] * 10)
+
+    def test_detour_is_legal_but_not_optimal(self):
+        moves = [(0, 2), (2, 0)] + list(ht.HanoiTowers.moves(6, 0, 1))
+        resultat = hv.verifyMoves(moves, 6, 1)
+        self.assertTrue(resultat.legal and resultat.reachedTarget)
+        self.assertFalse(resultat.optimal)
+
+    def test_empty_tower_and_invalid_codes(self):
+        resultat = hv.verifyMoves([(0, 1), (2, 0)], 3)
+        self.assertEqual(resultat.firstViolation, 1)
+        self.assertIn("vide", resultat.reason)
+        for mauvais in ([(0, 1), (1, 1)], [(0, 1), (0, 3)], array('B', [0, 6]), array('i', [0, 257])):
+            resultat = hv.verifyMoves(mauvais, 3)
+            self.assertEqual(resultat.firstViolation, 1, mauvais)
+            self.assertEqual(resultat.final, [1, 0, 0])
+
+    def test_violation_across_block_boundaries(self):
+        initial = [0, 2, 1, 1, 0, 2, 0, 1]
+        moves = _randomWalk(initial, 2 * hv.BLOCK + 100, seed=1)
+        for position in (0, hv.BLOCK - 1, hv.BLOCK, hv.BLOCK + 1, 2 * hv.BLOCK + 50):
+            corrompus = list(moves)
+            # Un mouvement illégal à cette position:  il y en a toujours un (partir d'une tour vide, ou poser un disque
+            # du dessus sur un plus petit).
+            corrompus[position] = next(m for m in ht.PEGPAIRS
+                                       if _firstViolation(initial, corrompus[:position] + [m]) == position)
+            for chunkSize in (7, 1000, 1 << 16):
+                resultat = hv.verifyMoves(_codes(corrompus), initial, chunkSize=chunkSize)
+                self.assertEqual(resultat.firstViolation, position, (position, chunkSize))
+                self.assertEqual(resultat.moves, position)
+
+    def test_random_walks_against_naive_replay(self):
+        hasard = random.Random(2)
+        for essai in range(200):
+            number = hasard.randint(1, 6)
+            initial = [hasard.randrange(3) for _ in range(number)]
+            moves = _randomWalk(initial, hasard.randint(0, 60), seed=essai)
+            if moves and hasard.random() < 0.7:
+                moves[hasard.randrange(len(moves))] = hasard.choice(ht.PEGPAIRS)
+            resultat = hv.verifyMoves(moves, initial, chunkSize=hasard.choice((3, 1 << 16)))
+            self.assertEqual(resultat.firstViolation, _firstViolation(initial, moves), (initial, moves))
+
+    def test_without_numpy(self):
+        moves = _randomWalk([0, 0, 1, 2], 50, seed=3)
+        moves[30] = (moves[29][1], moves[29][1])
+        with mock.patch.object(ht, 'np', None):
+            self.assertEqual(hv.verifyMoves(moves, [0, 0, 1, 2]).firstViolation, 30)
+            self.assertTrue(hv.verifyMoves(_codes(ht.HanoiTowers.moves(5, 0, 1)), 5, 1).optimal)
+
+    def test_move_log_input(self):
+        descripteur, chemin = tempfile.mkstemp(suffix='.hnoi')
+        os.close(descripteur)
+        try:
+            with hanoilog.MoveLogWriter(chemin, 9, 3, 1, 2) as writer:
+                ht.HanoiTowers(9).hanoiTransfer(9, 1, 2, writer.write)
+            resultat = hv.verifyMoves(chemin)
+            self.assertTrue(resultat.optimal)
+            self.assertEqual(resultat.final, [2] * 9)
+            with hanoilog.MoveLog(chemin) as log:
+                self.assertFalse(hv.verifyMoves(log, target=0).reachedTarget)
+                self.assertTrue(hv.verifyMoves(log[:100], chunkSize=16).legal)
+        finally:
+            os.remove(chemin)
+
+
+if __name__ == '__main__':
+    unittest.main()
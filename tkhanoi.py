@@ -1,5 +1,7 @@
+import sys
 import tkinter as tk
 import hanoi as ht
+import hanoigeometry as geo
 import random
 
 class Disk():
@@ -17,7 +19,8 @@ class Disk():
     Méthodes:
     update:  Bouge le disque à de nouvelles coordonnées.  Ce devrait être une méthode interne.
     elevate:  Bouge le disque verticalement.
-    slide:  Bouge le disque horizontalement."""
+    slide:  Bouge le disque horizontalement.
+    moveTo:  Place le disque à des coordonnées données."""
 
     def __init__(self, canvas, x, y, radius, height, **kwargs):
         """Constructeur.  C'est un simple constructeur par affectation des attributs.  Ensuite l'objet est dessiné
@@ -65,6 +68,23 @@ class Disk():
         self.xCenter += xOffset
         self.updateDisk()
 
+    def delete(self):
+        """Efface l'objet du canvas.  L'objet ne doit plus être utilisé ensuite."""
+        self.master.delete(self.index)
+
+    def moveTo(self, x, y, draw=True):
+        """Place le centre de l'objet aux coordonnées (x, y) du canvas, sans animation.
+
+        Args:
+            x(int):  Nouvelle abcisse du centre.
+            y(int):  Nouvelle ordonnée du centre.
+            draw(bool):  Si False, seules les coordonnées changent:  il faudra appeler updateDisk pour redessiner."""
+
+        self.xCenter = x
+        self.yCenter = y
+        if draw:
+            self.updateDisk()
+
     def __str__(self):
         """Affichera le numéro de l"objet dans le canvas-mère."""
         return f"{self.index}"
@@ -80,66 +100,9 @@ class ColoredDisk(Disk):
         self.master.itemconfigure(self.index, fill=f"#{random.randrange(0x111111, 0xFFFFFF):X}")
 
 class ColoredAnimatedDisk(ColoredDisk):
-    """Classe dérivée de ColoredDisk.  C'est donc un objet Disk, coloré de manière aléatoire, mais dont les déplacements
-    se font avec une animation.
-
-    Méthodes modifiées:
-    elevate():  Élève ou abaisse un disque, mais cette fois-ci avec une animation.  La vitesse du mouvement est
-    déterminée par les attributs de classe delay et step.
-
-    slide():  Glisse le disque latéralement avec une animation.
-
-    Attributs de classe:
-    delay(int):  Temps en millisecondes entre deux positions intermédiaires lors du déplacement.
-    step(int):  Écart en pixels entre deux positions intermédiaires lors du déplacement."""
-    
-    delay = 10
-    step = 10
-
-    @staticmethod
-    def keepMoving(coord, offset, endPoint, step):
-        """Calcule les paramètres d'animation pour un mouvement donné.
-        returns(bool, int):  bool est True si la coordonnée courante a atteint endPoint, donc si l'animation doit
-        terminer, int retourne step ou -step suivant le sens du mouvement voulu."""
-
-        if offset > 0:
-            return coord < endPoint, step
-        else:
-            return coord > endPoint, -step
-
-    def elevate(self, yOffset):
-        """Mouvement vertical animé.
-        Args:
-           yOffset(int):  Écart vertical souhaité, en pixels. """
-
-        # Calculer le y final (coordonnées locales)
-        endPoint = self.yCenter + yOffset
-
-        # Déterminer le sens du mouvement et si on est arrivé à destination
-        animationParameters = ColoredAnimatedDisk.keepMoving(self.yCenter, yOffset, endPoint, ColoredAnimatedDisk.step)
-
-        # Tant qu'on n'est pas arrivé
-        while animationParameters[0]:
-            # Utiliser la fonction de la classe disque pour bouger d'un incrément, attendre et redessiner le widget.
-            Disk.elevate(self, animationParameters[1])
-            self.master.after(ColoredAnimatedDisk.delay)
-            self.master.update()
-
-            # Recontrôler si on est arrivé à destination pour sortir de la boucle while
-            animationParameters = ColoredAnimatedDisk.keepMoving(self.yCenter, yOffset, endPoint, ColoredAnimatedDisk.step)
-
-    def slide(self, xOffset):
-        """Mouvement horizontal animé.
-        Args:
-            xOffset(int):  Écart horizontal en pixels."""
-
-        endPoint = self.xCenter + xOffset
-        animationParameters = ColoredAnimatedDisk.keepMoving(self.xCenter, xOffset, endPoint, ColoredAnimatedDisk.step)
-        while animationParameters[0]:
-            Disk.slide(self, animationParameters[1])
-            self.master.after(ColoredAnimatedDisk.delay)
-            self.master.update()
-            animationParameters = ColoredAnimatedDisk.keepMoving(self.xCenter, xOffset, endPoint, ColoredAnimatedDisk.step)
+    """Classe dérivée de ColoredDisk.  C'est donc un objet Disk, coloré de manière aléatoire, dont les déplacements
+    animés sont faits par AnimationScheduler:  un objet DiskTween le déplace avec moveTo, un peu à chaque image, sans
+    jamais attendre."""
 
 class StackOfDisks():
     """Représentation graphique d'une pile d'objet Disk.  Vu que cet objet est dessiné dans un objet Canvas, il faut
@@ -161,13 +124,13 @@ class StackOfDisks():
     number(int): Nombre de disques à empiler
     """
 
-    maxRadius = 100
-    minRadius = 10
+    maxRadius = geo.MAX_RADIUS
+    minRadius = geo.MIN_RADIUS
     rangeRadius = maxRadius - minRadius
-    baseOffset = 50
-    diskDefaultHeight = 10
+    baseOffset = geo.BASE_OFFSET
+    diskDefaultHeight = geo.DISK_HEIGHT
     diskDefaultRadius = 50
-    defaultSlidingHeight = 350
+    defaultSlidingHeight = geo.SLIDING_HEIGHT
 
 
 
@@ -182,17 +145,62 @@ class StackOfDisks():
         self.xCenter = x
         self.number = number
         self.stack = []
+
+        # Géométrie en cache:  hauteur du canvas et ordonnée (système du widget) du centre de chaque position de la
+        # pile.  Le cache n'est invalidé que lorsque le canvas change de taille.
+        self._height = None
+        self._slots = []
+        self.master.bind('<Configure>', self.resized, add='+')
+
         # On remplit la pile de disque avec la méthode fillStack.  Attention:  le canvas doit déjà être visible, soit
         # avec pack() ou grid() car utilise winfo_height() qui retourne toujours 1 si le widget est invisible.
         self.fillStack()
 
+    def canvasHeight(self):
+        """Retourne la hauteur du widget maitre.  Elle n'est demandée à Tk que la première fois, puis après chaque
+        changement de taille."""
+        if self._height is None:
+            self.master.update()
+            # On appelle winfo_height:  le widget maitre doit être visible!!!
+            self._height = self.master.winfo_height()
+        return self._height
+
+    def resized(self, event):
+        """Réaction à l'événement <Configure> du canvas:  si la hauteur a changé, on vide le cache et on replace les
+        disques, car leur position est mesurée à partir du bas du canvas.
+        Args:
+            event(objet Event):  Événement de Tk."""
+        if event.height != self._height:
+            self._height = event.height
+            self._slots = []
+            self.layout()
+
     def convertCoords(self, y):
         """Convertit les coordonnées du widget maitre dans un système ou y positif est vers le haut.
         Arg:
            y (int):  Coordonnée y à convertir."""
-        self.master.update()
-        # On appelle winfo_height:  le widget maitre doit être visible!!!
-        return self.master.winfo_height() - y
+        return self.canvasHeight() - y
+
+    def slotCenter(self, index):
+        """Retourne l'ordonnée du centre d'un disque à la position index de la pile, dans le système du widget maitre.
+        Les valeurs sont calculées une seule fois et conservées.
+        Args:
+            index(int):  Position dans la pile, 0 étant le bas."""
+        while len(self._slots) <= index:
+            self._slots.append(self.invertConvertCoords(self.yCenter(len(self._slots))))
+        return self._slots[index]
+
+    def layout(self):
+        """Replace tous les disques de la pile à leur position, sans animation."""
+        for (i, disk) in enumerate(self.stack):
+            disk.moveTo(self.xCenter, self.slotCenter(i))
+
+    def setDisks(self, disks):
+        """Remplace le contenu de la pile et redessine tous ses disques d'un coup, à leur position.
+        Args:
+            disks(liste d'objets Disk):  Disques de la pile, du bas vers le haut."""
+        self.stack = list(disks)
+        self.layout()
 
     def invertConvertCoords(self, y):
         """Transformation inverse de la précédente, pour revenir aux coordonnées du widget maitre(y positif vers le
@@ -207,10 +215,22 @@ class StackOfDisks():
         Args:
             index(int):  le numéro du disque.
         Returns:
-            (int):  Rayon du disque, compris entre StackOfDisks.minRadius et StackOfDisks.maxRadius
+            (float):  Rayon du disque, compris entre StackOfDisks.minRadius et StackOfDisks.maxRadius
         """
-        step = int(round(StackOfDisks.rangeRadius / (self.number - 1)))
-        return StackOfDisks.minRadius + (self.number - index - 1) * step
+        return StackOfDisks.radiusOf(self.number - index - 1, self.number)
+
+    @staticmethod
+    def radiusOf(disk, total):
+        """
+        Règle qui donne le rayon d'un disque à partir de son numéro dans le puzzle (0 étant le plus petit).  Voir
+        hanoigeometry.radiusOf, partagée avec le rendu sans affichage (hanoiframes).
+        Args:
+            disk(int):  Numéro du disque.
+            total(int):  Nombre total de disques.
+        Returns:
+            (float):  Rayon du disque, compris entre StackOfDisks.minRadius et StackOfDisks.maxRadius
+        """
+        return geo.radiusOf(disk, total, StackOfDisks.minRadius, StackOfDisks.maxRadius)
 
     def yCenter(self, index):
         """Calcule la coordonnée y du centre du disque, dans le système local.
@@ -218,7 +238,13 @@ class StackOfDisks():
             index(int):  numéro du disque
         Returns:
             (int):  Coordonnée y du centre du disque."""
-        return StackOfDisks.baseOffset + StackOfDisks.diskDefaultHeight * (2*index + 1)
+        return StackOfDisks.slotHeight(index)
+
+    @staticmethod
+    def slotHeight(index):
+        """Règle qui donne la coordonnée y (système local) du centre du disque à la position index d'une pile.  Voir
+        hanoigeometry.slotHeight."""
+        return geo.slotHeight(index, StackOfDisks.baseOffset, StackOfDisks.diskDefaultHeight)
 
     def yDiskCenter(self, diskObject):
         """Retourne la coordonée y du centre d'un disque, dans le système du widget maitre.
@@ -238,13 +264,14 @@ class StackOfDisks():
         for i in range(self.number):
             self.stack.append(Disk(self.master,
                                    self.xCenter,
-                                   self.convertCoords(self.yCenter(i)),
+                                   self.slotCenter(i),
                                    self.indexToRadius(i),
                                    StackOfDisks.diskDefaultHeight))
 
     def popDisk(self):
         """Retire le disque sur le dessus de la pile.  Attention, ne fait aucune modification des objets graphiques,
-        change seulement la liste des disques.  Il faut utiliser moveDiskToStack pour voir le déplacement.
+        change seulement la liste des disques.  Il faut utiliser moveDiskToStack ou AnimationScheduler pour voir le
+        déplacement.
         Returns:
             (objet Disk):  L'objet retiré ou None si la pile est vide."""
         if self.stack:
@@ -258,15 +285,35 @@ class StackOfDisks():
         """
         self.stack.append(diskObject)
 
+    def makeRoom(self):
+        """Appelée avant qu'un disque soit déposé sur la pile, pour qu'elle puisse réorganiser son affichage pendant que
+        ses disques sont immobiles.  Ne fait rien ici."""
+        pass
+
+    def path(self, disk, destinationStack):
+        """Calcule le trajet d'un disque qui quitte cette pile pour aller sur le dessus de destinationStack:  monter
+        jusqu'à defaultSlidingHeight, glisser au-dessus de la pile de destination, puis descendre.  À appeler avant
+        d'ajouter le disque à destinationStack.
+        Args:
+            disk(objet Disk):  Disque à déplacer.
+            destinationStack(objet StackOfDisks):  Pile de destination.
+        Returns:
+            (liste de (int, int)):  Les points de passage successifs, dans le système du widget maitre."""
+        destinationStack.makeRoom()
+        yHaut = self.invertConvertCoords(StackOfDisks.defaultSlidingHeight)
+        return [(disk.xCenter, yHaut),
+                (destinationStack.xCenter, yHaut),
+                (destinationStack.xCenter, destinationStack.slotCenter(len(destinationStack.stack)))]
+
     def moveDiskToStack(self, destinationStack):
-        """Transfère un disque d'une pile à une autre.  Met à jour les données et la représentation graphique.
+        """Transfère un disque d'une pile à une autre, sans animation:  le disque est placé tout de suite au bout de son
+        trajet (voir path).  Met à jour les données et la représentation graphique.  Pour un déplacement animé, voir
+        AnimationScheduler.
         Args:
             destinationStack(objet StackOfDisks):  Pile de destination."""
         disk = self.popDisk()
         if not disk is None:
-            disk.elevate(-(StackOfDisks.defaultSlidingHeight - self.yDiskCenter(disk)))
-            disk.slide(destinationStack.xCenter - self.xCenter)
-            disk.elevate(-(destinationStack.topOfStack() - StackOfDisks.defaultSlidingHeight))
+            disk.moveTo(*self.path(disk, destinationStack)[-1])
             destinationStack.pushDisk(disk)
 
     def __str__(self):
@@ -282,7 +329,7 @@ class StackOfColoredDisks(StackOfDisks):
         for i in range(self.number):
             self.stack.append(ColoredDisk(self.master,
                                           self.xCenter,
-                                          self.convertCoords(self.yCenter(i)),
+                                          self.slotCenter(i),
                                           self.indexToRadius(i),
                                           StackOfDisks.diskDefaultHeight))
 
@@ -293,85 +340,427 @@ class StackOfColoredAnimatedDisks(StackOfColoredDisks):
         for i in range(self.number):
             self.stack.append(ColoredAnimatedDisk(self.master,
                                                   self.xCenter,
-                                                  self.convertCoords(self.yCenter(i)),
+                                                  self.slotCenter(i),
                                                   self.indexToRadius(i),
                                                   StackOfDisks.diskDefaultHeight))
 
 
-if __name__=="__main__":
+class StackOfLevelOfDetailDisks(StackOfColoredAnimatedDisks):
+    """Pile pour un très grand nombre de disques.  Seuls les disques du dessus (au plus visibleDisks) existent comme
+    objets Disk;  les autres sont regroupés en quelques bandes (au plus maxBands rectangles), dont la hauteur totale
+    est fixe:  bandAreaHeight pixels au bas de la pile, partagés en proportion du nombre de disques de chaque bande.
+
+    Les disques sont créés au besoin:  lorsque la partie visible se vide, on fait apparaître les disques du dessus des
+    bandes, et lorsqu'elle est pleine, les disques du bas sont fondus dans les bandes.  Le nombre d'objets du canvas
+    reste donc borné, peu importe le nombre de disques.
 
-    def moveDisk(start, finish):
-        """Fonction qui exécute, avec les objets graphiques StackOfColoredAnimatedDisks les mouvements dictés par
-         puzzle.hanoiTransfer().
+    Attributs de classe:
+        visibleDisks:  Nombre maximal de disques dessinés individuellement
+        maxBands:  Nombre maximal de bandes
+        bandAreaHeight:  Hauteur en pixels réservée aux bandes, au-dessus de baseOffset
+        bandColor:  Couleur des bandes
+
+    Attributs:
+    total(int):  Nombre total de disques du puzzle, qui détermine le rayon de chaque disque.
+    disks(liste de int):  Numéros de tous les disques de la pile, du bas vers le haut (0 est le plus petit).
+    stack(liste d'objets Disk):  Disques visibles seulement, du bas vers le haut."""
+
+    visibleDisks = 10
+    maxBands = 8
+    bandAreaHeight = 60
+    bandColor = "#999999"
+
+    def __init__(self, master, x, number, total=None):
+        """Constructeur
         Args:
-            start(int):  Numéro de la pile d'où on doit retirer un disque.
-            finish(int): Numéro de la pile où l'on dépose le disque retiré."""
+             master (Objet Canvas):  Widget maitre
+             x (int):  Abcisse du centre de la pile
+             number (int):  Nombre de disques à empiler.
+             total (int):  Nombre total de disques du puzzle.  Par défaut, number."""
+
+        self.total = number if total is None else total
+        self.disks = list(range(number - 1, -1, -1))
+        self.bands = []
+        StackOfColoredAnimatedDisks.__init__(self, master, x, number)
 
-        global executeMoveDisk, stack, boutonDepart, numberOfMoves
+    def diskRadius(self, disk):
+        """Rayon d'un disque à partir de son numéro dans le puzzle, comme indexToRadius.
+        Args:
+            disk(int):  Numéro du disque, 0 étant le plus petit."""
+        return StackOfDisks.radiusOf(disk, self.total)
 
-        # L'exécution est autorisée:  transférer le disque
-        if executeMoveDisk:
-            stack[start].moveDiskToStack(stack[finish])
-            numberOfMoves += 1
+    def yCenter(self, index):
+        """Comme StackOfDisks.yCenter, mais au-dessus de la zone réservée aux bandes."""
+        return StackOfDisks.baseOffset + StackOfLevelOfDetailDisks.bandAreaHeight + \
+            StackOfDisks.diskDefaultHeight * (2*index + 1)
 
-        # L'exécution est suspendue:  attendre que le bouton soit pressé de nouveau.  Lorsque pressé, effectuer le
-        # transfert en attente.
-        else:
-            boutonDepart.waitvar(startStopButtonText)
-            stack[start].moveDiskToStack(stack[finish])
-            numberOfMoves += 1
+    def hidden(self):
+        """Retourne le nombre de disques regroupés dans les bandes."""
+        return len(self.disks) - len(self.stack)
 
-    def startStopButtonPressed():
-        """Commande correspondant à la pression du bouton arrêt,recommencer.  Sert à contrôler l'exécution du programme,
-        par l'intermédiaire de la variable executeMoveDisk, et modifie le texte du bouton."""
+    def fillStack(self):
+        self.bands = [self.master.create_rectangle(0, 0, 0, 0, fill=StackOfLevelOfDetailDisks.bandColor,
+                                                   state='hidden')
+                      for _ in range(StackOfLevelOfDetailDisks.maxBands)]
+        self._reveal(StackOfLevelOfDetailDisks.visibleDisks)
+
+    def _createDisk(self, disk, slot):
+        """Crée l'objet graphique d'un disque à une position de la pile.  La couleur dépend seulement du numéro du
+        disque, pour qu'un disque recréé garde la même couleur."""
+        diskObject = ColoredAnimatedDisk(self.master, self.xCenter, self.slotCenter(slot), self.diskRadius(disk),
+                                         StackOfDisks.diskDefaultHeight)
+        self.master.itemconfigure(diskObject.index,
+                                  fill=f"#{random.Random(disk).randrange(0x111111, 0xFFFFFF):X}")
+        diskObject.number = disk
+        return diskObject
+
+    def _reveal(self, count):
+        """Fait apparaître les count disques du dessus des bandes.  Appelée seulement si aucun disque n'est visible."""
+        count = min(count, self.hidden())
+        debut = len(self.disks) - count
+        self.stack = [self._createDisk(d, i) for (i, d) in enumerate(self.disks[debut:])]
+        self.updateBands()
+
+    def _collapse(self, count):
+        """Fond les count disques visibles du bas dans les bandes et redescend les autres."""
+        for diskObject in self.stack[:count]:
+            diskObject.delete()
+        self.stack = self.stack[count:]
+        self.layout()
+        self.updateBands()
+
+    def updateBands(self):
+        """Redessine les bandes à partir des disques cachés."""
+        cache = self.hidden()
+        nombre = min(cache, StackOfLevelOfDetailDisks.maxBands)
+        y = StackOfDisks.baseOffset
+        for (i, band) in enumerate(self.bands):
+            if i >= nombre:
+                self.master.itemconfigure(band, state='hidden')
+                continue
+            groupe = self.disks[i * cache // nombre:(i + 1) * cache // nombre]
+            hauteur = StackOfLevelOfDetailDisks.bandAreaHeight * len(groupe) / cache
+            rayon = self.diskRadius(max(groupe))
+            self.master.coords(band, self.xCenter - rayon, self.convertCoords(y + hauteur),
+                               self.xCenter + rayon, self.convertCoords(y))
+            self.master.itemconfigure(band, state='normal')
+            y += hauteur
+
+    def resized(self, event):
+        StackOfDisks.resized(self, event)
+        self.updateBands()
 
-        global puzzleNumber, executeMoveDisk, startStopButtonText, puzzle
+    def popDisk(self):
+        diskObject = StackOfDisks.popDisk(self)
+        if diskObject is not None:
+            self.disks.pop()
+            if not self.stack and self.hidden():
+                self._reveal(StackOfLevelOfDetailDisks.visibleDisks // 2)
+        return diskObject
+
+    def makeRoom(self):
+        if len(self.stack) >= StackOfLevelOfDetailDisks.visibleDisks:
+            self._collapse(len(self.stack) - StackOfLevelOfDetailDisks.visibleDisks // 2)
+
+    def pushDisk(self, diskObject):
+        self.makeRoom()
+        self.disks.append(diskObject.number)
+        self.stack.append(diskObject)
+
+    def setDiskNumbers(self, disks):
+        """Remplace le contenu de la pile:  efface les disques visibles et recrée ceux du dessus.
+        Args:
+            disks(liste de int):  Numéros des disques, du bas vers le haut."""
+        for diskObject in self.stack:
+            diskObject.delete()
+        self.stack = []
+        self.disks = list(disks)
+        self._reveal(StackOfLevelOfDetailDisks.visibleDisks)
+
+
+class DiskTween():
+    """Animation d'un disque le long d'une suite de points de passage.  L'animation n'attend jamais:  c'est
+    AnimationScheduler qui la fait avancer d'une certaine distance à chaque image.
+
+    Attributs:
+    disk(objet Disk):  Disque animé.
+    waypoints(liste de (int, int)):  Points de passage restants, dans le système du widget maitre."""
 
-        # Commencer l'algorithme, executeMoveDisk est dèjà True alors on lance le programme.
+    def __init__(self, disk, waypoints):
+        self.disk = disk
+        self.waypoints = list(waypoints)
+
+    def finished(self):
+        """Retourne True si le disque est arrivé au dernier point de passage."""
+        return not self.waypoints
+
+    def advance(self, distance, draw=True):
+        """Avance le disque d'au plus distance pixels le long du trajet et le redessine une seule fois.
+        Args:
+            distance(float):  Distance disponible pour cette image.
+            draw(bool):  Si False, le disque n'est pas redessiné (voir Disk.moveTo).
+        Returns:
+            (float):  Distance non utilisée, si le disque est arrivé avant de l'avoir parcourue."""
+
+        x, y = self.disk.xCenter, self.disk.yCenter
+        while self.waypoints and distance > 0:
+            xCible, yCible = self.waypoints[0]
+            ecart = abs(xCible - x) + abs(yCible - y)
+            if ecart <= distance:
+                x, y = xCible, yCible
+                distance -= ecart
+                self.waypoints.pop(0)
+            else:
+                # Les trajets sont horizontaux ou verticaux:  un seul des deux termes est non nul.
+                x += distance * ((xCible > x) - (xCible < x))
+                y += distance * ((yCible > y) - (yCible < y))
+                distance = 0
+        self.disk.moveTo(x, y, draw)
+        return distance
+
+
+class AnimationScheduler():
+    """Moteur d'animation piloté par la boucle d'événements de Tk.  Une seule fonction, tick, est programmée avec
+    after() toutes les frameDelay millisecondes:  elle tire les mouvements du solveur au besoin et fait avancer les
+    disques en mouvement de speed pixels.  Si speed est grand, plusieurs mouvements peuvent se terminer dans la même
+    image:  les positions intermédiaires ne sont alors jamais dessinées, et la résolution n'est pas ralentie.  Rien ne
+    bloque, donc l'interface reste réactive et start/stop ne demandent aucune boucle d'événements imbriquée.
+
+    Attributs:
+    master(widget):  Widget utilisé pour programmer les images avec after().
+    stacks(liste de StackOfDisks):  Piles graphiques, une par tour.
+    moves(itérateur):  Source des mouvements (départ, arrivée), par exemple HanoiTowers.hanoiTransfer sans callback.
+    frameDelay(int):  Temps en millisecondes entre deux images.
+    speed(float):  Distance en pixels parcourue par image.
+    tweens(liste de DiskTween):  Animations en cours.
+    numberOfMoves(int):  Nombre de mouvements terminés.
+    onFinish(fonction):  Appelée sans argument lorsque la source de mouvements est épuisée.
+    onFrame(fonction):  Appelée sans argument après chaque image."""
+
+    frameDelay = 16
+
+    def __init__(self, master, stacks, moves, speed=10, onFinish=None):
+        self.master = master
+        self.stacks = stacks
+        self.moves = moves
+        self.speed = speed
+        self.onFinish = onFinish
+        self.onFrame = None
+        self.tweens = []
+        self.numberOfMoves = 0
+        self.running = False
+        self._after = None
+
+    def start(self):
+        """Démarre ou reprend l'animation."""
+        self.running = True
+        if self._after is None:
+            self._after = self.master.after(AnimationScheduler.frameDelay, self.tick)
+
+    def stop(self):
+        """Suspend l'animation après l'image en cours.  Les disques restent où ils sont."""
+        self.running = False
+        if self._after is not None:
+            self.master.after_cancel(self._after)
+            self._after = None
+
+    def setMoves(self, moves, numberOfMoves=0):
+        """Change la source des mouvements, par exemple après un saut dans la solution.  Les animations en cours sont
+        abandonnées:  les piles doivent déjà être dans l'état qui correspond à la nouvelle source.
+        Args:
+            moves(itérateur):  Nouvelle source des mouvements.
+            numberOfMoves(int):  Nombre de mouvements déjà effectués."""
+        self.moves = moves
+        self.tweens = []
+        self.numberOfMoves = numberOfMoves
+
+    def _nextTween(self):
+        """Tire le prochain mouvement et prépare son animation.  Les piles sont mises à jour tout de suite, seul le
+        dessin suit.  Retourne None s'il n'y a plus de mouvement."""
+        move = next(self.moves, None)
+        if move is None:
+            return None
+        start, finish = self.stacks[move[0]], self.stacks[move[1]]
+        disk = start.popDisk()
+        if disk is None:
+            return DiskTween(None, [])
+        tween = DiskTween(disk, start.path(disk, finish))
+        finish.pushDisk(disk)
+        return tween
+
+    @staticmethod
+    def _redraw(disks):
+        """Redessine en une seule passe les disques modifiés pendant une image:  un seul appel coords par disque."""
+        for disk in disks:
+            disk.updateDisk()
+
+    def tick(self):
+        """Calcule une image:  répartit speed pixels de déplacement entre les animations, en tirant de nouveaux
+        mouvements tant qu'il en reste, puis programme l'image suivante."""
+        self._after = None
+        if not self.running:
+            return
+
+        # Les disques déplacés pendant l'image ne sont redessinés qu'une fois, à la fin.
+        modifies = set()
+        budget = self.speed
+        while budget > 0:
+            if not self.tweens:
+                tween = self._nextTween()
+                if tween is None:
+                    self._redraw(modifies)
+                    self.running = False
+                    if self.onFrame is not None:
+                        self.onFrame()
+                    if self.onFinish is not None:
+                        self.onFinish()
+                    return
+                self.tweens.append(tween)
+            tween = self.tweens[0]
+            if tween.disk is not None:
+                budget = tween.advance(budget, draw=False)
+                modifies.add(tween.disk)
+            if tween.finished():
+                self.tweens.pop(0)
+                self.numberOfMoves += 1
+
+        self._redraw(modifies)
+        if self.onFrame is not None:
+            self.onFrame()
+        self._after = self.master.after(AnimationScheduler.frameDelay, self.tick)
+
+
+if __name__=="__main__":
+
+    def startStopButtonPressed():
+        """Commande correspondant à la pression du bouton arrêt,recommencer.  Démarre, suspend ou reprend l'animation,
+        et modifie le texte du bouton."""
+
+        # Commencer l'algorithme:  l'animation tire les mouvements du générateur de hanoiTransfer au fur et à mesure.
         if startStopButtonText.get() == "Commencer":
             startStopButtonText.set("Arrêter")
+            animation.start()
 
-            # Coeur du programme:  hanoiTransfer génère les mouvements et les envoie à la fonction moveDisk qui modifie
-            # les dessins en conséquence.
-            puzzle.hanoiTransfer(puzzleNumber, 0, 1, moveDisk)
-            print(f"{numberOfMoves} coups avec {puzzleNumber} disques.")
-
-        # Suspendre l'exécution du programme, avec executeMoveDisk = False
+        # Suspendre l'animation
         elif startStopButtonText.get() == "Arrêter":
             startStopButtonText.set("Recommencer")
-            executeMoveDisk = False
+            animation.stop()
 
-         # Reprendre le programme après suspension de l'activité
-        else:
+        # Reprendre l'animation après suspension
+        elif startStopButtonText.get() == "Recommencer":
             startStopButtonText.set("Arrêter")
-            executeMoveDisk = True
+            animation.start()
+
+    def animationFinished():
+        """Appelée par l'animation lorsque tous les mouvements sont terminés."""
+        startStopButtonText.set("Terminé")
+        print(f"{animation.numberOfMoves} coups avec {puzzleNumber} disques.")
+
+    def speedChanged(value):
+        """Commande du curseur de vitesse:  distance parcourue par image, en pixels."""
+        animation.speed = float(value)
+
+    def jumpTo(k):
+        """Affiche directement l'état du puzzle après k mouvements, sans rejouer les mouvements précédents, puis
+        prépare l'animation pour qu'elle continue à partir de là.  L'animation est suspendue.
+        Args:
+            k(int):  Numéro du mouvement."""
+
+        if animation.running or startStopButtonText.get() == "Terminé":
+            startStopButtonText.set("Recommencer")
+        animation.stop()
+
+        # L'état se calcule directement à partir de k:  on replace tous les disques d'un coup.
+        animation.setMoves(puzzle.resumeTransfer(k, puzzleNumber, 0, 1), k)
+        configuration = puzzle.configuration()
+        for (tour, pile) in enumerate(stack):
+            numeros = [d for d in range(puzzleNumber - 1, -1, -1) if configuration[d] == tour]
+            if levelOfDetail:
+                pile.setDiskNumbers(numeros)
+            else:
+                pile.setDisks([disks[d] for d in numeros])
+        showProgress()
+
+    def timelineMoved(event):
+        """Appelée lorsque l'utilisateur déplace le curseur de la ligne du temps avec la souris.  Le curseur n'a pas de
+        command:  Tk l'exécuterait aussi, plus tard, après chaque timeline.set de showProgress, ce qui arrêterait
+        l'animation.  Avec beaucoup de disques, la valeur (un float) peut dépasser le dernier mouvement."""
+        jumpTo(min(max(int(timeline.get()), 0), totalMoves))
+
+    def jumpButtonPressed():
+        """Commande du bouton "Aller":  saute au mouvement inscrit dans le champ de saisie."""
+        try:
+            k = int(jumpText.get())
+        except ValueError:
+            return
+        jumpTo(min(max(k, 0), totalMoves))
+
+    def showProgress():
+        """Appelée après chaque image:  place le curseur de la ligne du temps sur le mouvement courant."""
+        timeline.set(animation.numberOfMoves)
 
 
     # Fenêtre principale
     fenetre = tk.Tk()
     fenetre.title("Tours de Hanoi")
 
-    # Objet HanoiTowers contenant l'algorithme récursif de résolution des Tours de Hanoi
-    puzzleNumber = 6
+    # Objet HanoiTowers contenant l'algorithme récursif de résolution des Tours de Hanoi.  Le nombre de disques peut
+    # être donné sur la ligne de commande.
+    puzzleNumber = int(sys.argv[1]) if len(sys.argv) > 1 else 6
     puzzle = ht.HanoiTowers(puzzleNumber)
-    numberOfMoves = 0  # Va compter les coups pour reussir le puzzle.
+    totalMoves = (1 << puzzleNumber) - 1
 
     # Widget canvas dans lequel on dessinera
     toile = tk.Canvas(fenetre, width=1000, height=500)
     toile.pack()
 
-    # Objets graphiques qui représentent les tours: une pleine et deux vides
+    # Objets graphiques qui représentent les tours: une pleine et deux vides.  Si les disques ne tiennent pas sous la
+    # hauteur de glissement, on passe aux piles à niveau de détail, qui ne dessinent que les disques du dessus.
+    levelOfDetail = StackOfDisks.baseOffset + 2 * StackOfDisks.diskDefaultHeight * puzzleNumber > \
+        StackOfDisks.defaultSlidingHeight
     stack = [None, None, None]
-    stack[0] = StackOfColoredAnimatedDisks(toile, 250, puzzleNumber)
-    stack[1] = StackOfColoredAnimatedDisks(toile, 500, 0)
-    stack[2] = StackOfColoredAnimatedDisks(toile, 750, 0)
-
-    # Gestion du déroulement avec le bouton "arrêt,recommencer"
+    if levelOfDetail:
+        stack[0] = StackOfLevelOfDetailDisks(toile, 250, puzzleNumber, puzzleNumber)
+        stack[1] = StackOfLevelOfDetailDisks(toile, 500, 0, puzzleNumber)
+        stack[2] = StackOfLevelOfDetailDisks(toile, 750, 0, puzzleNumber)
+    else:
+        stack[0] = StackOfColoredAnimatedDisks(toile, 250, puzzleNumber)
+        stack[1] = StackOfColoredAnimatedDisks(toile, 500, 0)
+        stack[2] = StackOfColoredAnimatedDisks(toile, 750, 0)
+
+    # disks[d] est l'objet graphique du disque numéro d de puzzle (le disque 0 est le plus petit, en haut de la pile).
+    # Les piles à niveau de détail créent leurs disques au besoin et n'en ont pas besoin.
+    disks = stack[0].stack[::-1]
+
+    # Animation:  hanoiTransfer, sans callback, génère les mouvements que l'animation tire au besoin.
+    animation = AnimationScheduler(fenetre, stack, puzzle.hanoiTransfer(puzzleNumber, 0, 1),
+                                   onFinish=animationFinished)
+
+    # Gestion du déroulement avec le bouton "arrêt,recommencer", et de la vitesse avec un curseur
     startStopButtonText = tk.StringVar()
     startStopButtonText.set("Commencer")
     boutonDepart = tk.Button(fenetre, textvariable=startStopButtonText, command=startStopButtonPressed)
     boutonDepart.pack(side='bottom')
-    executeMoveDisk = True
+    vitesse = tk.Scale(fenetre, from_=1, to=500, orient='horizontal', label="Vitesse (pixels par image)",
+                       command=speedChanged)
+    vitesse.set(animation.speed)
+    vitesse.pack(side='bottom', fill='x')
+
+    # Ligne du temps:  un curseur pour se déplacer dans la solution, et un champ pour sauter à un mouvement précis.
+    timeline = tk.Scale(fenetre, from_=0, to=totalMoves, orient='horizontal', label="Mouvement")
+    # Les liaisons de la classe Scale, qui déplacent le curseur, doivent passer avant celles du widget.
+    tags = timeline.bindtags()
+    timeline.bindtags((tags[1], tags[0]) + tags[2:])
+    timeline.bind('<B1-Motion>', timelineMoved)
+    timeline.bind('<ButtonRelease-1>', timelineMoved)
+    timeline.pack(side='bottom', fill='x')
+    animation.onFrame = showProgress
+
+    sautCadre = tk.Frame(fenetre)
+    sautCadre.pack(side='bottom')
+    jumpText = tk.StringVar()
+    tk.Entry(sautCadre, textvariable=jumpText, width=12).pack(side='left')
+    tk.Button(sautCadre, text="Aller", command=jumpButtonPressed).pack(side='left')
 
     # Exécuter le programme
     fenetre.mainloop()